@@ -0,0 +1,107 @@
+# colector.py — DataCollector con memoria acotada.
+#
+# Guarda los reporteros de modelo en arreglos de NumPy preasignados que se
+# usan como anillo: el costo de collect() es constante y la memoria no crece
+# con la cantidad de pasos. Si se da `directorio_volcado`, antes de
+# sobrescribir el anillo se vuelca el bloque completo a disco (.npz), así no
+# se pierde historia.
+import os
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+Reportero = Union[str, Callable]
+
+
+class ColectorAnillo:
+    """
+    Reemplazo del DataCollector de Mesa para reporteros de modelo numéricos.
+
+    Los reporteros se declaran igual que en Mesa (nombre de atributo o
+    función que recibe el modelo). `intervalo` toma una muestra cada tantas
+    llamadas a collect(). `model_vars` mantiene la interfaz de Mesa (la usa
+    ChartModule) y `como_arreglos()` devuelve vistas sin copia.
+    """
+
+    def __init__(self, model_reporters: Dict[str, Reportero], capacidad: int = 10000,
+                 intervalo: int = 1, directorio_volcado: Optional[str] = None):
+        if capacidad < 1 or intervalo < 1:
+            raise ValueError("capacidad e intervalo deben ser >= 1")
+        self.model_reporters = dict(model_reporters)
+        self.capacidad = capacidad
+        self.intervalo = intervalo
+        self.directorio_volcado = directorio_volcado
+        if directorio_volcado:
+            os.makedirs(directorio_volcado, exist_ok=True)
+
+        # Buffer doble: cada valor se escribe en i y en i + capacidad, así la
+        # ventana de las últimas `capacidad` muestras siempre es contigua.
+        self._columnas = {nombre: np.empty(2 * capacidad) for nombre in self.model_reporters}
+        self._pasos = np.empty(2 * capacidad, dtype=np.int64)
+        self._llamadas = 0
+        self.muestras = 0   # muestras guardadas desde el inicio
+        self.volcadas = 0   # muestras ya escritas a disco
+        self.bloques_volcados = []
+
+    def _valor(self, reportero: Reportero, model):
+        if isinstance(reportero, str):
+            return getattr(model, reportero)
+        return reportero(model)
+
+    def collect(self, model):
+        llamada = self._llamadas
+        self._llamadas += 1
+        if llamada % self.intervalo:
+            return
+
+        cap = self.capacidad
+        if self.muestras and self.muestras % cap == 0 and self.directorio_volcado:
+            self._volcar()
+        i = self.muestras % cap
+        for nombre, reportero in self.model_reporters.items():
+            v = self._valor(reportero, model)
+            col = self._columnas[nombre]
+            col[i] = v
+            col[i + cap] = v
+        self._pasos[i] = self._pasos[i + cap] = llamada
+        self.muestras += 1
+
+    def _volcar(self):
+        """Escribe a disco el anillo lleno (las últimas `capacidad` muestras)."""
+        ruta = os.path.join(self.directorio_volcado, f"bloque_{len(self.bloques_volcados):05d}.npz")
+        cap = self.capacidad
+        np.savez(ruta, paso=self._pasos[:cap], **{n: c[:cap] for n, c in self._columnas.items()})
+        self.bloques_volcados.append(ruta)
+        self.volcadas = self.muestras
+
+    # ---- lectura ----
+    def _ventana(self):
+        n = min(self.muestras, self.capacidad)
+        inicio = self.muestras % self.capacidad if self.muestras > self.capacidad else 0
+        return slice(inicio, inicio + n)
+
+    def como_arreglos(self) -> Dict[str, np.ndarray]:
+        """Últimas `capacidad` muestras en orden, como vistas (sin copiar)."""
+        v = self._ventana()
+        datos = {nombre: col[v] for nombre, col in self._columnas.items()}
+        datos["paso"] = self._pasos[v]
+        return datos
+
+    @property
+    def model_vars(self) -> Dict[str, np.ndarray]:
+        v = self._ventana()
+        return {nombre: col[v] for nombre, col in self._columnas.items()}
+
+    def historial_completo(self) -> Dict[str, np.ndarray]:
+        """Bloques volcados a disco más lo que sigue en memoria (esto sí copia)."""
+        partes = [dict(np.load(ruta)) for ruta in self.bloques_volcados]
+        actual = self.como_arreglos()
+        pendientes = self.muestras - self.volcadas
+        partes.append({k: a[len(a) - pendientes:] for k, a in actual.items()})
+        return {k: np.concatenate([p[k] for p in partes]) for k in actual}
+
+    def get_model_vars_dataframe(self):
+        import pandas as pd
+        datos = self.como_arreglos()
+        paso = datos.pop("paso")
+        return pd.DataFrame(datos, index=pd.Index(paso, name="paso"))
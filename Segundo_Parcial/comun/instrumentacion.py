@@ -0,0 +1,122 @@
+# instrumentacion.py — temporizadores por fase y contadores, opcionales.
+#
+# Los modelos guardan `self.instrumentacion = None` por defecto; todos los
+# puntos de medición revisan eso primero, así que apagada cuesta una
+# comparación. Encendida acumula estadísticas por fase y por agente, y
+# puede exportar una traza en formato Chrome (chrome://tracing o Perfetto).
+import functools
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+_NULO = nullcontext()
+
+
+class Instrumentacion:
+    def __init__(self, max_eventos: int = 1_000_000):
+        self.max_eventos = max_eventos
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._stats = {}        # nombre -> [llamadas, total_ns, min_ns, max_ns]
+        self._por_agente = {}   # (nombre, agente) -> [llamadas, total_ns]
+        self._eventos = []      # (nombre, agente, inicio_ns, duracion_ns)
+        self.contadores = defaultdict(int)
+        self._origen = time.perf_counter_ns()
+
+    def registrar(self, nombre: str, inicio: int, fin: int, agente=None):
+        dur = fin - inicio
+        st = self._stats.get(nombre)
+        if st is None:
+            self._stats[nombre] = [1, dur, dur, dur]
+        else:
+            st[0] += 1
+            st[1] += dur
+            if dur < st[2]: st[2] = dur
+            if dur > st[3]: st[3] = dur
+        if agente is not None:
+            pa = self._por_agente.setdefault((nombre, agente), [0, 0])
+            pa[0] += 1
+            pa[1] += dur
+        if len(self._eventos) < self.max_eventos:
+            self._eventos.append((nombre, agente, inicio, dur))
+
+    @contextmanager
+    def medir(self, nombre: str, agente=None):
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, inicio, time.perf_counter_ns(), agente)
+
+    def contar(self, nombre: str, n: int = 1):
+        self.contadores[nombre] += n
+
+    # ---- salida ----
+    def resumen(self) -> dict:
+        fases = {
+            nombre: {
+                "llamadas": n,
+                "total_ms": total / 1e6,
+                "media_us": total / n / 1e3,
+                "min_us": mn / 1e3,
+                "max_us": mx / 1e3,
+            }
+            for nombre, (n, total, mn, mx) in self._stats.items()
+        }
+        por_agente = {
+            f"{nombre}[{agente}]": {"llamadas": n, "total_ms": total / 1e6}
+            for (nombre, agente), (n, total) in self._por_agente.items()
+        }
+        return {"fases": fases, "por_agente": por_agente, "contadores": dict(self.contadores)}
+
+    def imprimir_resumen(self):
+        r = self.resumen()
+        for nombre, f in sorted(r["fases"].items(), key=lambda kv: -kv[1]["total_ms"]):
+            print(f"{nombre:32} {f['llamadas']:8} llamadas  {f['total_ms']:10.3f} ms  "
+                  f"{f['media_us']:9.2f} us/llamada")
+        for nombre, valor in sorted(r["contadores"].items()):
+            print(f"{nombre:32} {valor:8}")
+
+    def exportar_chrome_trace(self, ruta: str):
+        """Eventos completos ("ph": "X") en microsegundos; un hilo por agente."""
+        hilos = {}
+        eventos = []
+        for nombre, agente, inicio, dur in self._eventos:
+            tid = hilos.setdefault(agente, len(hilos))
+            eventos.append({
+                "name": nombre, "ph": "X", "pid": 1, "tid": tid,
+                "ts": (inicio - self._origen) / 1e3, "dur": dur / 1e3,
+            })
+        for agente, tid in hilos.items():
+            eventos.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                            "args": {"name": "modelo" if agente is None else str(agente)}})
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms",
+                       "otherData": {"contadores": dict(self.contadores)}}, f)
+
+
+def fase(inst, nombre: str, agente=None):
+    """Contexto que mide `nombre`, o uno vacío si la instrumentación está apagada."""
+    return _NULO if inst is None else inst.medir(nombre, agente)
+
+
+def instrumentado(metodo):
+    """
+    Decorador para step() de agentes y modelos: mide cada llamada como
+    "<Clase>.<metodo>" con el unique_id del agente. Busca la instrumentación
+    en self.model (agentes) o en self (modelos).
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        inst = getattr(getattr(self, "model", self), "instrumentacion", None)
+        if inst is None:
+            return metodo(self, *args, **kwargs)
+        inicio = time.perf_counter_ns()
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            inst.registrar(f"{type(self).__name__}.{metodo.__name__}", inicio,
+                           time.perf_counter_ns(), getattr(self, "unique_id", None))
+    return envoltura
@@ -0,0 +1,37 @@
+# medicion.py — piezas comunes de los benchmarks de los dos puntos.
+#
+# Los benchmarks miden el tiempo en una corrida y la memoria en otra, porque
+# tracemalloc hace más lento todo lo que corre mientras está activo. De
+# memoria se informa el pico: tracemalloc solo ve los bloques vivos en cada
+# snapshot, no cuántas asignaciones hubo en el medio.
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+def memoria_pico(funcion, *args, **kwargs) -> int:
+    """Bytes pico reservados mientras corre `funcion(*args, **kwargs)` (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        funcion(*args, **kwargs)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+
+def metadatos() -> dict:
+    """Commit, versión de Python, plataforma y fecha, para comparar corridas."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
@@ -0,0 +1,77 @@
+# tiempo_import.py — subcomando `tiempo-import` de los cli.py de cada punto.
+#
+# Mide el import en frío de los módulos sin interfaz en un intérprete nuevo y
+# falla si alguno se pasa del presupuesto, deja cargado un módulo de interfaz
+# propio o, si se declaró sin Mesa, carga Mesa. Cada cli.py lo registra con
+# agregar_subcomando(), indicando su directorio y sus módulos de interfaz.
+#
+# En Mesa 2.x `import mesa` ya carga mesa.visualization, mesa_viz_tornado y
+# tornado (mesa/__init__.py importa la visualización). Eso no se puede evitar
+# desde aquí: se informa como costo conocido de Mesa, no como falla.
+import os
+import subprocess
+import sys
+
+# Los módulos compartidos también se pueden medir directamente
+COMUN = os.path.dirname(os.path.abspath(__file__))
+
+PILA_UI_MESA = ("mesa.visualization", "mesa_viz_tornado", "tornado")
+
+
+def medir_import(modulo, directorio, modulos_interfaz, repeticiones=3):
+    """
+    Mejor tiempo de `import modulo` en un intérprete nuevo (sin caches de
+    sys.modules, con los .pyc ya compilados) corrido desde `directorio`.
+    Devuelve (segundos, interfaz, pila_mesa, usa_mesa): los `modulos_interfaz`
+    que quedaron cargados, los de PILA_UI_MESA y si se cargó Mesa.
+    """
+    codigo = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {COMUN!r})\n"
+        "t = time.perf_counter()\n"
+        f"import {modulo}\n"
+        "print(time.perf_counter() - t)\n"
+        f"print(','.join(m for m in {tuple(modulos_interfaz)!r} if m in sys.modules))\n"
+        f"print(','.join(m for m in {PILA_UI_MESA!r} if m in sys.modules))\n"
+        "print('mesa' in sys.modules)\n"
+    )
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=directorio,
+                                capture_output=True, text=True, check=True).stdout.split("\n")
+        mejor = min(mejor, float(salida[0]))
+    interfaz = [m for m in salida[1].split(",") if m]
+    pila_mesa = [m for m in salida[2].split(",") if m]
+    return mejor, interfaz, pila_mesa, salida[3] == "True"
+
+
+def cmd_tiempo_import(args):
+    fallas = 0
+    for modulo in args.modulos:
+        segundos, interfaz, pila_mesa, usa_mesa = medir_import(
+            modulo, args.directorio, args.modulos_interfaz, args.repeticiones)
+        ok = (segundos <= args.presupuesto and not interfaz
+              and not (usa_mesa and modulo in args.sin_mesa))
+        fallas += not ok
+        extra = f"  carga {', '.join(interfaz)}" if interfaz else ""
+        if usa_mesa and modulo in args.sin_mesa:
+            extra += "  carga Mesa (debería ser sin Mesa)"
+        elif pila_mesa:
+            extra += f"  [costo de Mesa: {', '.join(pila_mesa)}]"
+        print(f"{modulo:20} {segundos * 1e3:8.1f} ms  (presupuesto {args.presupuesto * 1e3:.0f} ms)"
+              f"  {'ok' if ok else 'EXCEDIDO'}{extra}")
+    return 1 if fallas else 0
+
+
+def agregar_subcomando(sub, modulos, modulos_interfaz, presupuesto, directorio, sin_mesa=()):
+    """
+    Registra `tiempo-import` en los subparsers `sub` de un cli.py. Los
+    módulos de `sin_mesa` fallan si su import carga Mesa.
+    """
+    p = sub.add_parser("tiempo-import", help="verifica el tiempo de import en frío")
+    p.add_argument("modulos", nargs="*", default=list(modulos))
+    p.add_argument("--presupuesto", type=float, default=presupuesto, help="segundos")
+    p.add_argument("--repeticiones", type=int, default=3)
+    p.set_defaults(funcion=cmd_tiempo_import, directorio=os.path.abspath(directorio),
+                   modulos_interfaz=tuple(modulos_interfaz), sin_mesa=tuple(sin_mesa))
+    return p
@@ -0,0 +1,182 @@
+# visualizacion_delta.py — ModularServer que manda solo lo que cambió.
+#
+# El ModularServer de Mesa avanza un paso del modelo por cada frame que pide
+# el navegador y en cada frame manda el estado completo de todos los
+# elementos. ServidorDelta cambia eso en dos cosas:
+#
+#   * ritmo: por cada frame corre al menos `pasos_por_frame` pasos y, si se
+#     da `fps_max`, sigue corriendo pasos hasta que pase 1 / fps_max desde el
+#     frame anterior. La interfaz deja de frenar a la simulación.
+#   * deltas: los elementos envueltos en ElementoDelta mandan solo los
+#     cambios. En una grilla son los portrayals que aparecieron o
+#     desaparecieron desde el último frame; en el resto, None si la salida
+#     es la misma (el navegador no vuelve a dibujar).
+#
+# El estado de los deltas vive en el servidor, así que está pensado para un
+# solo navegador conectado a la vez (igual que el modelo, que es uno solo).
+#
+# Uso:
+#   server = ServidorDelta(Modelo, [ElementoDelta(grid, por_portrayal=True),
+#                                   ElementoDelta(texto), chart],
+#                          "Nombre", params, pasos_por_frame=10, fps_max=10)
+import itertools
+import json
+import time
+from collections import Counter
+from typing import Optional
+
+import tornado.escape
+from mesa.visualization.ModularVisualization import (
+    ModularServer, SocketHandler, VisualizationElement
+)
+
+# Se agrega después del js_code original: toma el módulo que este acaba de
+# crear y le cambia render/reset por versiones que entienden deltas.
+_JS_PORTRAYALS = """
+(function () {
+  const modulo = elements[elements.length - 1];
+  const dibujar = modulo.render;
+  const reiniciar = modulo.reset;
+  let cache = {};
+  modulo.render = function (data) {
+    if (data === null) return;
+    if (data.completo) cache = {};
+    for (const id of data.quitar) delete cache[id];
+    Object.assign(cache, data.poner);
+    const capas = {};
+    for (const id in cache) {
+      const p = cache[id];
+      (capas[p.Layer] = capas[p.Layer] || []).push(p);
+    }
+    dibujar(capas);
+  };
+  modulo.reset = function () { cache = {}; reiniciar(); };
+})();
+"""
+
+_JS_VALOR = """
+(function () {
+  const modulo = elements[elements.length - 1];
+  const dibujar = modulo.render;
+  modulo.render = function (data) { if (data !== null) dibujar(data); };
+})();
+"""
+
+
+class ElementoDelta(VisualizationElement):
+    """
+    Envuelve un elemento de visualización de Mesa.
+
+    Con `por_portrayal=True` (para CanvasGrid y sus subclases) la salida de
+    render es {"completo": bool, "poner": {id: portrayal}, "quitar": [id]}:
+    cada portrayal distinto recibe un id y solo viaja cuando aparece. Si no,
+    se manda la salida completa solo cuando cambia y None en otro caso.
+    """
+
+    def __init__(self, elemento: VisualizationElement, por_portrayal: bool = False):
+        self.elemento = elemento
+        self.por_portrayal = por_portrayal
+        self.package_includes = elemento.package_includes
+        self.local_includes = elemento.local_includes
+        self.local_dir = elemento.local_dir
+        self.js_code = elemento.js_code + (_JS_PORTRAYALS if por_portrayal else _JS_VALOR)
+        self._ids = itertools.count()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida lo mandado: el próximo render es completo."""
+        self._anterior = None
+        self._vivos = {}  # clave del portrayal -> ids mandados con esa clave
+
+    def render(self, model):
+        estado = self.elemento.render(model)
+        if not self.por_portrayal:
+            if self._anterior is not None and estado == self._anterior:
+                return None
+            self._anterior = estado
+            return estado
+
+        completo = self._anterior is None
+        self._anterior = True
+        actuales = Counter(
+            json.dumps(p, sort_keys=True, default=str)
+            for capa in estado.values() for p in capa
+        )
+        poner, quitar = {}, []
+        # Primero las bajas, así una clave que ya no está libera sus ids
+        for clave in [c for c in self._vivos if c not in actuales]:
+            quitar.extend(self._vivos.pop(clave))
+        for clave, n in actuales.items():
+            ids = self._vivos.setdefault(clave, [])
+            while len(ids) > n:
+                quitar.append(ids.pop())
+            if len(ids) < n:
+                p = json.loads(clave)
+                while len(ids) < n:
+                    ids.append(next(self._ids))
+                    poner[ids[-1]] = p
+        return {"completo": completo, "poner": poner, "quitar": quitar}
+
+
+class SocketDelta(SocketHandler):
+    """Socket del ServidorDelta: corre los pasos de un frame por cada get_step."""
+
+    def on_message(self, message):
+        msg = tornado.escape.json_decode(message)
+        app = self.application
+        if msg["type"] != "get_step":
+            # reset pasa por reset_model, que también reinicia los deltas
+            return super().on_message(message)
+        if not app.model.running:
+            self.write_message({"type": "end"})
+        else:
+            app.avanzar()
+            self.write_message(self.viz_state_message)
+
+
+class ServidorDelta(ModularServer):
+    """
+    ModularServer con `pasos_por_frame` pasos mínimos por frame y, si se da
+    `fps_max`, a lo sumo fps_max frames por segundo: entre un frame y el
+    siguiente el modelo sigue avanzando en lugar de esperar al navegador.
+    Con el ChartModule de Mesa queda un punto de la serie por frame.
+    """
+
+    def __init__(self, model_cls, visualization_elements, name="Mesa Model",
+                 model_params=None, port=None, pasos_por_frame: int = 1,
+                 fps_max: Optional[float] = None):
+        if pasos_por_frame < 1:
+            raise ValueError("pasos_por_frame debe ser al menos 1")
+        self.pasos_por_frame = pasos_por_frame
+        self.fps_max = fps_max
+        self.pasos_ultimo_frame = 0
+        self._ultimo_frame = None
+        super().__init__(model_cls, visualization_elements, name, model_params, port)
+        # add_handlers inserta antes de la regla comodín: tapa al /ws original
+        self.add_handlers(r".*", [(r"/ws", SocketDelta)])
+
+    def avanzar(self) -> int:
+        """Corre los pasos de un frame; devuelve cuántos corrió."""
+        pasos = 0
+        while pasos < self.pasos_por_frame and self.model.running:
+            self.model.step()
+            pasos += 1
+        if self.fps_max and self._ultimo_frame is not None:
+            limite = self._ultimo_frame + 1.0 / self.fps_max
+            while self.model.running and time.perf_counter() < limite:
+                self.model.step()
+                pasos += 1
+        self._ultimo_frame = time.perf_counter()
+        self.pasos_ultimo_frame = pasos
+        return pasos
+
+    def reiniciar_deltas(self):
+        self._ultimo_frame = None
+        for elemento in self.visualization_elements:
+            if isinstance(elemento, ElementoDelta):
+                elemento.reiniciar()
+
+    def reset_model(self):
+        # El navegador vacía sus caches al reiniciar: el próximo frame va completo
+        super().reset_model()
+        self.reiniciar_deltas()
@@ -0,0 +1,134 @@
+# barrido.py
+# --------------------------------------------------------
+# Barrido de hiperparámetros de Simulacion sin interfaz, en paralelo.
+#
+# Uso:
+#   python barrido.py --cantidades 10 50 100 --tasas 0.01 0.1 1.0 \
+#       --iteraciones 50 --semillas 5 --salida barrido.csv
+#   python barrido.py --aleatorio 200 --salida barrido.csv
+#
+# Cada corrida guarda sus parámetros, la serie "Error" del DataCollector,
+# la época de convergencia y el motivo de parada. Todo se junta en una sola
+# tabla por columnas (CSV, o Parquet si la salida termina en .parquet).
+# --------------------------------------------------------
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+COLUMNAS = [
+    "cantidad_por_clase", "tasa", "iteraciones", "semilla",
+    "epocas", "epoca_convergencia", "motivo_parada", "error_final", "segundos", "errores",
+]
+
+
+def combinaciones_grilla(cantidades, tasas, iteraciones, semillas):
+    """Producto cartesiano de los valores, repetido para cada semilla."""
+    return [
+        {"cantidad_por_clase": c, "tasa": t, "iteraciones": it, "semilla": s}
+        for c, t, it, s in itertools.product(cantidades, tasas, iteraciones, semillas)
+    ]
+
+
+def combinaciones_aleatorias(n, rango_cantidad=(5, 200), rango_tasa=(0.001, 1.0),
+                             rango_iteraciones=(5, 200), semilla=0):
+    """n combinaciones al azar (tasa en escala logarítmica)."""
+    rng = np.random.default_rng(semilla)
+    log_t = np.log10(rango_tasa)
+    return [
+        {
+            "cantidad_por_clase": int(rng.integers(rango_cantidad[0], rango_cantidad[1] + 1)),
+            "tasa": float(10 ** rng.uniform(log_t[0], log_t[1])),
+            "iteraciones": int(rng.integers(rango_iteraciones[0], rango_iteraciones[1] + 1)),
+            "semilla": i,
+        }
+        for i in range(n)
+    ]
+
+
+def correr(params):
+    """Una corrida completa de Simulacion; se ejecuta dentro de un proceso del pool."""
+    from simulacion_mesa import Simulacion
+
+    t0 = time.perf_counter()
+    modelo = Simulacion(params["cantidad_por_clase"], params["tasa"], params["iteraciones"],
+                        seed=params["semilla"])
+    while modelo.running:
+        modelo.step()
+    errores = modelo.datacollector.model_vars["Error"]
+
+    return {
+        **params,
+        "epocas": modelo.current_step,
+        "epoca_convergencia": modelo.epoca_convergencia,
+        "motivo_parada": modelo.motivo_parada,
+        "error_final": errores[-1] if len(errores) else None,
+        "segundos": time.perf_counter() - t0,
+        "errores": [int(e) for e in errores],
+    }
+
+
+def ejecutar(combinaciones, procesos=None):
+    """Corre todas las combinaciones en un pool de procesos (todos los núcleos por defecto)."""
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        return [correr(p) for p in combinaciones]
+    tam_tanda = max(1, len(combinaciones) // (procesos * 4))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(correr, combinaciones, chunksize=tam_tanda))
+
+
+def a_columnas(resultados):
+    """Lista de filas -> dict de columnas (la serie de errores queda como texto)."""
+    tabla = {c: [] for c in COLUMNAS}
+    for r in resultados:
+        for c in COLUMNAS:
+            valor = r.get(c)
+            if c == "errores":
+                valor = " ".join(str(e) for e in valor)
+            tabla[c].append(valor)
+    return tabla
+
+
+def guardar(tabla, ruta):
+    if ruta.endswith(".parquet"):
+        import pandas as pd  # viene con Mesa; Parquet además necesita pyarrow
+        pd.DataFrame(tabla).to_parquet(ruta, index=False)
+        return
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS)
+        escritor.writerows(zip(*(tabla[c] for c in COLUMNAS)))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Barrido de hiperparámetros de la simulación")
+    ap.add_argument("--cantidades", type=int, nargs="+", default=[10, 50])
+    ap.add_argument("--tasas", type=float, nargs="+", default=[0.01, 0.1, 1.0])
+    ap.add_argument("--iteraciones", type=int, nargs="+", default=[50])
+    ap.add_argument("--semillas", type=int, default=3, help="repeticiones por combinación")
+    ap.add_argument("--aleatorio", type=int, default=0,
+                    help="si es > 0, muestrea esta cantidad de combinaciones al azar")
+    ap.add_argument("--procesos", type=int, default=None)
+    ap.add_argument("--salida", default="barrido.csv")
+    args = ap.parse_args(argv)
+
+    if args.aleatorio:
+        combinaciones = combinaciones_aleatorias(args.aleatorio)
+    else:
+        combinaciones = combinaciones_grilla(args.cantidades, args.tasas, args.iteraciones,
+                                             range(args.semillas))
+
+    t0 = time.perf_counter()
+    resultados = ejecutar(combinaciones, args.procesos)
+    guardar(a_columnas(resultados), args.salida)
+    print(f"{len(resultados)} corridas en {time.perf_counter() - t0:.1f} s -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# benchmark_simulacion.py
+# --------------------------------------------------------
+# Benchmark sin interfaz de la simulación del perceptrón.
+#
+# Uso:
+#   python benchmark_simulacion.py --salida bench_simulacion.json
+#
+# Mide la simulación completa variando puntos por clase, tamaño del grid,
+# iteraciones y planificador, y además cada etapa del step por separado
+# (entrenamiento, redibujo de la línea y schedule.step) para poder ubicar
+# una regresión. Guarda todo en JSON para comparar entre commits.
+# --------------------------------------------------------
+
+import argparse
+import json
+import time
+
+import numpy as np
+from mesa.time import RandomActivation, SimultaneousActivation
+
+from simulacion_mesa import Simulacion
+import rutas
+rutas.agregar_comun()
+from medicion import memoria_pico, metadatos
+
+PLANIFICADORES = {
+    "RandomActivation": RandomActivation,
+    "SimultaneousActivation": SimultaneousActivation,
+}
+SEMILLA = 0  # misma corrida en cada commit
+
+
+def _correr(params, planificador):
+    modelo = Simulacion(planificador=planificador, seed=SEMILLA, **params)
+    pasos = 0
+    while modelo.running:
+        modelo.step()
+        pasos += 1
+    return modelo, pasos
+
+
+def medir(params, planificador):
+    # Tiempo sin tracemalloc (lo hace más lento), memoria en una segunda corrida
+    t0 = time.perf_counter()
+    _, pasos = _correr(params, planificador)
+    total = time.perf_counter() - t0
+
+    pico = memoria_pico(_correr, params, planificador)
+
+    return {
+        "pasos": pasos,
+        "segundos": total,
+        "seg_por_paso": total / pasos if pasos else 0.0,
+        "pasos_por_seg": pasos / total if total else 0.0,
+        "memoria_pico_bytes": pico,
+    }
+
+
+def _cronometrar(funcion, repeticiones):
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - t0) / repeticiones
+
+
+def medir_etapas(params, planificador, repeticiones=10):
+    """Tiempo medio de cada etapa de Simulacion.step, llamada por separado."""
+    modelo = Simulacion(planificador=planificador, seed=SEMILLA, **params)
+    perceptron = modelo.perceptron
+
+    def entrenar():
+        perceptron.entrenar_matriz(modelo.X_entrenamiento, modelo.y_entrenamiento,
+                                   modo=modelo.modo_entrenamiento, tam_lote=modelo.tam_lote)
+
+    # Dos juegos de pesos alternados para que cada llamada mueva la línea
+    # (con los mismos pesos _dibujar_linea no hace nada)
+    entrenar()
+    alternos = [perceptron.pesos.copy(), perceptron.pesos * np.array([-1.0, 1.0, 1.0])]
+    turno = [0]
+
+    def dibujar_linea():
+        turno[0] ^= 1
+        perceptron.pesos = alternos[turno[0]]
+        modelo._dibujar_linea()
+
+    def planificar():
+        modelo.predicciones = perceptron.predecir_lote(modelo.X_puntos)
+        modelo.schedule.step()
+
+    return {
+        "entrenar_seg": _cronometrar(entrenar, repeticiones),
+        "dibujar_linea_seg": _cronometrar(dibujar_linea, repeticiones),
+        "schedule_seg": _cronometrar(planificar, repeticiones),
+    }
+
+
+def casos(rapido=False):
+    """Combinaciones a medir: se varía un parámetro a la vez."""
+    base = {"cantidad_por_clase": 50, "tam_grid": 20, "iteraciones": 10}
+    cantidades = (10, 100) if rapido else (10, 100, 1000)
+    grids = (20, 50) if rapido else (20, 50, 100)
+    iteraciones = (10,) if rapido else (10, 50)
+    for n in cantidades:
+        yield "cantidad_por_clase", {**base, "cantidad_por_clase": n}
+    for g in grids:
+        yield "tam_grid", {**base, "tam_grid": g}
+    for it in iteraciones:
+        yield "iteraciones", {**base, "iteraciones": it}
+
+
+def ejecutar(rapido=False):
+    resultados = []
+    for nombre_plan, plan in PLANIFICADORES.items():
+        for variable, params in casos(rapido):
+            fila = {"variable": variable, "planificador": nombre_plan, **params}
+            fila.update(medir(params, plan))
+            fila.update(medir_etapas(params, plan))
+            resultados.append(fila)
+    return {"benchmark": "simulacion", "meta": metadatos(), "casos": resultados}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de la simulación del perceptrón")
+    ap.add_argument("--salida", default="bench_simulacion.json")
+    ap.add_argument("--rapido", action="store_true", help="solo tamaños pequeños")
+    args = ap.parse_args(argv)
+
+    datos = ejecutar(args.rapido)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2)
+
+    for c in datos["casos"]:
+        print(f"{c['variable']:18} n={c['cantidad_por_clase']:5} grid={c['tam_grid']:4} "
+              f"it={c['iteraciones']:3} {c['planificador']:22} "
+              f"{c['pasos_por_seg']:9.1f} pasos/s  "
+              f"entrenar={c['entrenar_seg'] * 1e3:7.2f}ms "
+              f"linea={c['dibujar_linea_seg'] * 1e3:7.2f}ms "
+              f"schedule={c['schedule_seg'] * 1e3:7.2f}ms")
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
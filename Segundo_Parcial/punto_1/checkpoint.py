@@ -0,0 +1,107 @@
+import base64
+import json
+import random
+import struct
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Formato (little-endian):
+#   cabecera  "PCKP" | versión u16 | 0 u16 | largo de los metadatos u64
+#   metadatos JSON (forma de los pesos, tasa, largo del historial, estados
+#             de los generadores), rellenado con espacios hasta múltiplo de 8
+#   pesos     float64, en el orden de `forma`
+#   errores   int64, historial de error por época
+# Al cargar, los dos arreglos se abren con np.memmap (solo lectura): no se
+# leen del disco hasta que se usan.
+MAGIA = b"PCKP"
+VERSION = 1
+_CABECERA = struct.Struct("<4sHHQ")
+
+
+class Checkpoint(NamedTuple):
+    pesos: np.ndarray
+    tasa: float
+    errores: np.ndarray
+    rngs: dict        # nombre -> estado serializado (ver estado_rng)
+    meta: dict        # datos extra guardados junto al modelo
+
+
+def estado_rng(rng) -> dict:
+    """Estado de un np.random.Generator o un random.Random, listo para JSON."""
+    if isinstance(rng, np.random.Generator):
+        return {"tipo": "numpy", "estado": rng.bit_generator.state}
+    if isinstance(rng, random.Random):
+        version, interno, gauss = rng.getstate()
+        # 625 enteros de 32 bits: en base64 ocupan un tercio que como lista JSON
+        crudo = base64.b64encode(np.asarray(interno, dtype="<u4").tobytes()).decode("ascii")
+        return {"tipo": "random", "estado": [version, crudo, gauss]}
+    raise TypeError(f"Generador no soportado: {type(rng).__name__}")
+
+
+def restaurar_rng(rng, estado: dict):
+    """Deja `rng` en el estado guardado (debe ser del mismo tipo)."""
+    if estado["tipo"] == "numpy" and isinstance(rng, np.random.Generator):
+        rng.bit_generator.state = estado["estado"]
+    elif estado["tipo"] == "random" and isinstance(rng, random.Random):
+        version, crudo, gauss = estado["estado"]
+        interno = np.frombuffer(base64.b64decode(crudo), dtype="<u4").tolist()
+        rng.setstate((version, tuple(interno), gauss))
+    else:
+        raise TypeError(f"El estado es de tipo {estado['tipo']} y el generador {type(rng).__name__}")
+
+
+def guardar_checkpoint(ruta, pesos, tasa, errores=(), rngs=None, **meta):
+    """
+    Guarda pesos (cualquier forma: vector del perceptrón binario o matriz
+    del multiclase), tasa de aprendizaje, historial de errores y el estado
+    de los generadores dados en `rngs` ({nombre: generador}).
+    """
+    pesos = np.ascontiguousarray(pesos, dtype="<f8")
+    errores = np.ascontiguousarray(errores, dtype="<i8")
+    datos = {
+        "forma": list(pesos.shape),
+        "n_errores": len(errores),
+        "tasa": float(tasa),
+        "rngs": {nombre: estado_rng(g) for nombre, g in (rngs or {}).items()},
+        "meta": meta,
+    }
+    texto = json.dumps(datos).encode("utf-8")
+    texto += b" " * (-(_CABECERA.size + len(texto)) % 8)  # arreglos alineados a 8 bytes
+    with open(ruta, "wb") as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION, 0, len(texto)))
+        f.write(texto)
+        f.write(pesos.tobytes())
+        f.write(errores.tobytes())
+
+
+def _arreglo(ruta, dtype, offset, forma, mmap):
+    if not mmap or int(np.prod(forma)) == 0:
+        with open(ruta, "rb") as f:
+            f.seek(offset)
+            return np.fromfile(f, dtype=dtype, count=int(np.prod(forma))).reshape(forma)
+    return np.memmap(ruta, dtype=dtype, mode="r", offset=offset, shape=tuple(forma))
+
+
+def cargar_checkpoint(ruta, mmap: bool = True) -> Checkpoint:
+    """Lee la cabecera y mapea los arreglos (copiar los pesos antes de entrenar)."""
+    with open(ruta, "rb") as f:
+        magia, version, _, largo = _CABECERA.unpack(f.read(_CABECERA.size))
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} no es un checkpoint del perceptrón")
+        if version != VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {version}")
+        datos = json.loads(f.read(largo))
+    offset = _CABECERA.size + largo
+    forma = datos["forma"]
+    pesos = _arreglo(ruta, "<f8", offset, forma, mmap)
+    offset += 8 * int(np.prod(forma))
+    errores = _arreglo(ruta, "<i8", offset, [datos["n_errores"]], mmap)
+    return Checkpoint(pesos, datos["tasa"], errores, datos["rngs"], datos["meta"])
+
+
+def como_checkpoint(checkpoint) -> Optional[Checkpoint]:
+    """Acepta una ruta o un Checkpoint ya cargado (o None)."""
+    if checkpoint is None or isinstance(checkpoint, Checkpoint):
+        return checkpoint
+    return cargar_checkpoint(checkpoint)
@@ -0,0 +1,165 @@
+# cli.py
+# --------------------------------------------------------
+# Punto de entrada sin interfaz del perceptrón.
+#
+# Uso:
+#   python cli.py entrenar --cantidad 500 --iteraciones 50 --checkpoint pesos.ckpt
+#   python cli.py datos puntos.f32 --cantidad 1000000
+#   python cli.py entrenar --datos puntos.f32 --tam-lote 1024
+#   python cli.py simular --cantidad 50 --tasa 0.1 --iteraciones 100 --seed 1
+#   python cli.py barrido --aleatorio 20 --salida barrido.csv
+#   python cli.py benchmark --salida bench.json
+#   python cli.py visualizar --delta --pasos-por-frame 10
+#   python cli.py tiempo-import --presupuesto 2.0
+#
+# Cada comando importa lo que usa recién al correr, así `entrenar` no carga
+# Mesa y nada carga los módulos de visualización propios salvo `visualizar`.
+# Los comandos que usan Mesa (`simular`, `barrido`) igual cargan
+# mesa.visualization y tornado: en Mesa 2.x `import mesa` los trae.
+# `barrido` y `benchmark` le pasan el resto de los argumentos al main() de
+# barrido.py y benchmark_simulacion.py.
+# --------------------------------------------------------
+
+import argparse
+import importlib
+import os
+import sys
+
+import rutas
+rutas.agregar_comun()
+from tiempo_import import agregar_subcomando
+
+# Segundos que puede tardar `import simulacion_mesa` en un proceso nuevo
+# (arranque en frío de un worker del barrido). La mayor parte es Mesa.
+PRESUPUESTO_IMPORT_S = 2.0
+
+DELEGADOS = {"barrido": "barrido", "benchmark": "benchmark_simulacion"}
+
+# Módulos propios que solo deberían cargarse al pedir la interfaz
+MODULOS_INTERFAZ = ("visualizacion_delta",)
+
+
+def cmd_datos(args):
+    from generador import generar_puntos_stream, guardar_dataset
+
+    filas = guardar_dataset(args.ruta, generar_puntos_stream(args.cantidad, semilla=args.semilla))
+    print(f"{filas} filas float32 escritas en {args.ruta}")
+
+
+def cmd_entrenar(args):
+    from perceptron import PerceptronAgent
+
+    retomar = args.checkpoint is not None and os.path.exists(args.checkpoint)
+    p = PerceptronAgent(2, args.tasa, args.iteraciones, semilla=args.semilla,
+                        checkpoint=args.checkpoint if retomar else None)
+    if retomar:
+        print("retomando desde", args.checkpoint)
+
+    if args.datos:
+        epocas, motivo = p.entrenar_flujo(args.datos, tam_chunk=args.tam_chunk, tam_lote=args.tam_lote,
+                                          paciencia=args.paciencia, tiempo_max=args.tiempo_max)
+    else:
+        from generador import generar_puntos
+        puntos = generar_puntos(args.cantidad, semilla=args.semilla)
+        epocas, motivo = p.entrenar_hasta_converger(puntos, args.paciencia, args.tiempo_max)
+
+    print(f"epocas: {epocas} (total {p.epocas})  motivo: {motivo}  "
+          f"error final: {p.errores[-1] if p.errores else None}")
+    print("pesos:", p.pesos)
+    if args.checkpoint:
+        p.guardar(args.checkpoint)
+        print("pesos guardados en", args.checkpoint)
+
+
+def cmd_simular(args):
+    from simulacion_mesa import Simulacion
+
+    inst = None
+    if args.instrumentar:
+        from instrumentacion import Instrumentacion
+        inst = Instrumentacion()
+    modelo = Simulacion(args.cantidad, args.tasa, args.iteraciones,
+                        modo_entrenamiento=args.modo_entrenamiento, tam_lote=args.tam_lote,
+                        paciencia=args.paciencia, modo_puntos=args.modo_puntos,
+                        seed=args.seed, instrumentacion=inst, checkpoint=args.checkpoint)
+    while modelo.running:
+        modelo.step()
+
+    errores = modelo.datacollector.model_vars["Error"]
+    print(f"epocas: {modelo.current_step}  motivo: {modelo.motivo_parada}  "
+          f"convergencia: {modelo.epoca_convergencia}")
+    print("errores:", [int(e) for e in errores])
+    if args.guardar:
+        modelo.guardar(args.guardar)
+        print("checkpoint guardado en", args.guardar)
+    if inst is not None:
+        inst.imprimir_resumen()
+
+
+def cmd_visualizar(args):
+    from simulacion_mesa import ejecutar_visualizacion
+
+    ejecutar_visualizacion(args.delta, args.pasos_por_frame, args.fps_max)
+
+
+def crear_parser():
+    ap = argparse.ArgumentParser(description="Perceptrón sin interfaz")
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("datos", help="genera un dataset float32 para entrenar --datos")
+    p.add_argument("ruta")
+    p.add_argument("--cantidad", type=int, default=100_000, help="puntos por clase")
+    p.add_argument("--semilla", type=int, default=None)
+    p.set_defaults(funcion=cmd_datos)
+
+    p = sub.add_parser("entrenar", help="entrena el perceptrón puro (sin Mesa)")
+    p.add_argument("--cantidad", type=int, default=10, help="puntos por clase (sin --datos)")
+    p.add_argument("--datos", help="archivo float32 de `datos`, se lee por bloques")
+    p.add_argument("--tasa", type=float, default=0.1)
+    p.add_argument("--iteraciones", type=int, default=100)
+    p.add_argument("--semilla", type=int, default=None)
+    p.add_argument("--paciencia", type=int, default=None)
+    p.add_argument("--tiempo-max", type=float, default=None)
+    p.add_argument("--tam-chunk", type=int, default=65536)
+    p.add_argument("--tam-lote", type=int, default=None)
+    p.add_argument("--checkpoint", help="retoma desde aquí si existe y guarda al terminar")
+    p.set_defaults(funcion=cmd_entrenar)
+
+    p = sub.add_parser("simular", help="corre Simulacion hasta que termina")
+    p.add_argument("--cantidad", type=int, default=10, help="puntos por clase")
+    p.add_argument("--tasa", type=float, default=0.1)
+    p.add_argument("--iteraciones", type=int, default=10)
+    p.add_argument("--modo-entrenamiento", choices=("muestra", "lote"), default="muestra")
+    p.add_argument("--tam-lote", type=int, default=None)
+    p.add_argument("--modo-puntos", choices=("agentes", "arreglos"), default="agentes")
+    p.add_argument("--paciencia", type=int, default=None)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--checkpoint", help="arranca desde este checkpoint")
+    p.add_argument("--guardar", help="guarda un checkpoint al terminar")
+    p.add_argument("--instrumentar", action="store_true", help="imprime tiempos por fase")
+    p.set_defaults(funcion=cmd_simular)
+
+    for nombre, modulo in DELEGADOS.items():
+        sub.add_parser(nombre, help=f"argumentos de {modulo}.py (ver `{nombre} -h`)", add_help=False)
+
+    p = sub.add_parser("visualizar", help="abre la interfaz de Mesa en el puerto 8521")
+    p.add_argument("--delta", action="store_true", help="usa ServidorDelta")
+    p.add_argument("--pasos-por-frame", type=int, default=1)
+    p.add_argument("--fps-max", type=float, default=None)
+    p.set_defaults(funcion=cmd_visualizar)
+
+    agregar_subcomando(sub, ["simulacion_mesa", "perceptron"], MODULOS_INTERFAZ, PRESUPUESTO_IMPORT_S,
+                       os.path.dirname(os.path.abspath(__file__)), sin_mesa=("perceptron",))
+    return ap
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in DELEGADOS:
+        return importlib.import_module(DELEGADOS[argv[0]]).main(argv[1:])
+    args = crear_parser().parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
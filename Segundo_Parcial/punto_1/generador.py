@@ -1,30 +1,132 @@
+import os
 import random
 
+import numpy as np
+
 # Variables globales para acceder luego desde otros módulos
+# (solo las llena generar_puntos, por compatibilidad)
 puntos_rojos = []
 puntos_azules = []
 
-def generar_puntos(cantidad_por_clase=10, rango_x=(0, 10), rango_y=(0, 10), ruido=0.2):
+
+def _crear_rng(semilla=None, rng=None):
+    if rng is not None:
+        return rng
+    if semilla is None:
+        # Sin semilla se toma del módulo random global, como la versión
+        # original: random.seed(...) sigue dejando los datos reproducibles.
+        semilla = random.getrandbits(64)
+    return np.random.default_rng(semilla)
+
+
+def _llenar_clase(rng, destino, clase, rango_x, rango_y, ruido):
+    """Llena `destino` (vista (n, 3) de un arreglo ya reservado) con puntos de una clase."""
+    n = len(destino)
+    destino[:, 0] = rng.uniform(rango_x[0], rango_x[1], n)
+    if clase == 1:
+        destino[:, 1] = rng.uniform((rango_y[1] / 2) + 1, rango_y[1], n)  # arriba
+    else:
+        destino[:, 1] = rng.uniform(rango_y[0], (rango_y[1] / 2) - 1, n)  # abajo
+    if ruido:
+        destino[:, 0] += rng.uniform(-ruido, ruido, n)
+        destino[:, 1] += rng.uniform(-ruido, ruido, n)
+    destino[:, 2] = clase
+
+
+def _generar(rng, n, rango_x, rango_y, ruido):
+    """Arreglo (2n, 3): n rojos (+1) seguidos de n azules (-1), en una sola reserva."""
+    datos = np.empty((2 * n, 3))
+    _llenar_clase(rng, datos[:n], 1, rango_x, rango_y, ruido)
+    _llenar_clase(rng, datos[n:], -1, rango_x, rango_y, ruido)
+    return datos
+
+
+def generar_puntos_array(cantidad_por_clase=10, rango_x=(0, 10), rango_y=(0, 10), ruido=0.2,
+                         semilla=None, rng=None, mezclar=True):
+    """
+    Genera todos los puntos de una sola vez, sin objetos Python por punto.
+    Devuelve un arreglo (2 * cantidad_por_clase, 3) con filas [x, y, etiqueta]:
+    primero los rojos (+1) y luego los azules (-1), salvo que se mezclen.
+    """
+    rng = _crear_rng(semilla, rng)
+    datos = _generar(rng, cantidad_por_clase, rango_x, rango_y, ruido)
+    if mezclar:
+        datos = datos[rng.permutation(len(datos))]  # más rápido que shuffle por filas
+    return datos
+
+
+def generar_puntos_stream(cantidad_por_clase=10, tam_bloque=4096, rango_x=(0, 10), rango_y=(0, 10),
+                          ruido=0.2, semilla=None, rng=None):
+    """
+    Generador de bloques (arreglos (m, 3) con m <= tam_bloque) que en total
+    suman cantidad_por_clase puntos de cada clase. Cada bloque trae la mitad
+    de cada clase, ya mezclado, así que la memoria no depende del total.
+    """
+    rng = _crear_rng(semilla, rng)
+    por_bloque = max(1, tam_bloque // 2)
+    restantes = cantidad_por_clase
+    while restantes > 0:
+        n = min(por_bloque, restantes)
+        bloque = _generar(rng, n, rango_x, rango_y, ruido)
+        bloque = bloque[rng.permutation(len(bloque))]
+        restantes -= n
+        yield bloque
+
+
+def generar_puntos(cantidad_por_clase=10, rango_x=(0, 10), rango_y=(0, 10), ruido=0.2,
+                   semilla=None, rng=None):
+    """Versión original: lista mezclada de [x, y, etiqueta] (usa generar_puntos_array)."""
     global puntos_rojos, puntos_azules
-    puntos_rojos = []
-    puntos_azules = []
-
-    # Puntos rojos (+1)
-    for _ in range(cantidad_por_clase):
-        x = random.uniform(rango_x[0], rango_x[1])
-        y = random.uniform((rango_y[1] / 2) + 1, rango_y[1])  # arriba
-        x += random.uniform(-ruido, ruido)
-        y += random.uniform(-ruido, ruido)
-        puntos_rojos.append([x, y, 1])
-
-    # Puntos azules (-1)
-    for _ in range(cantidad_por_clase):
-        x = random.uniform(rango_x[0], rango_x[1])
-        y = random.uniform(rango_y[0], (rango_y[1] / 2) - 1)  # abajo
-        x += random.uniform(-ruido, ruido)
-        y += random.uniform(-ruido, ruido)
-        puntos_azules.append([x, y, -1])
-
-    puntos_totales = puntos_rojos + puntos_azules
-    random.shuffle(puntos_totales)
-    return puntos_totales
+    rng = _crear_rng(semilla, rng)
+    datos = generar_puntos_array(cantidad_por_clase, rango_x, rango_y, ruido,
+                                 rng=rng, mezclar=False)
+    filas = [[x, y, int(clase)] for x, y, clase in datos.tolist()]
+    puntos_rojos = filas[:cantidad_por_clase]
+    puntos_azules = filas[cantidad_por_clase:]
+
+    return [filas[i] for i in rng.permutation(len(filas))]
+
+
+def generar_puntos_multiclase(cantidad_por_clase=10, n_caracteristicas=2, n_clases=3, separacion=5.0,
+                              ruido=1.0, semilla=None, rng=None, mezclar=True):
+    """
+    Nubes gaussianas para el perceptrón multiclase: un centro al azar por
+    clase (desvío `separacion`) y puntos alrededor (desvío `ruido`).
+    Devuelve (X, y): X de (n_clases * cantidad_por_clase, n_caracteristicas)
+    y las etiquetas 0..n_clases-1.
+    """
+    rng = _crear_rng(semilla, rng)
+    centros = rng.normal(0.0, separacion, (n_clases, n_caracteristicas))
+    y = np.repeat(np.arange(n_clases), cantidad_por_clase)
+    X = rng.normal(0.0, ruido, (len(y), n_caracteristicas))
+    X += centros[y]
+    if mezclar:
+        orden = rng.permutation(len(y))
+        X, y = X[orden], y[orden]
+    return X, y
+
+
+def guardar_dataset(ruta, bloques):
+    """
+    Escribe bloques (arreglos (m, columnas), p. ej. de generar_puntos_stream)
+    como filas float32 sin cabecera, uno tras otro: la memoria usada es la de
+    un bloque. Devuelve la cantidad de filas escritas.
+    """
+    filas = 0
+    with open(ruta, "wb") as f:
+        for bloque in bloques:
+            bloque = np.asarray(bloque, dtype="<f4")
+            f.write(np.ascontiguousarray(bloque).tobytes())
+            filas += len(bloque)
+    return filas
+
+
+def abrir_dataset(ruta, n_columnas=3):
+    """Mapea un archivo de guardar_dataset como arreglo (filas, n_columnas) de solo lectura."""
+    tam_fila = 4 * n_columnas
+    tam = os.path.getsize(ruta)
+    if tam % tam_fila:
+        raise ValueError(f"{ruta} no tiene filas completas de {n_columnas} float32")
+    if tam == 0:
+        return np.empty((0, n_columnas), dtype="<f4")
+    return np.memmap(ruta, dtype="<f4", mode="r", shape=(tam // tam_fila, n_columnas))
@@ -1,14 +1,121 @@
+import os
 import random
+import time
+
+import numpy as np
+
+from checkpoint import como_checkpoint, guardar_checkpoint, restaurar_rng
+from generador import abrir_dataset
+
+
+def matriz_con_bias(entradas, n_inputs=2):
+    """
+    Convierte entradas (n, d) en una matriz contigua (n, d + 1) con la
+    columna de bias ya agregada, para no usar np.append en cada muestra.
+    """
+    entradas = np.asarray(entradas, dtype=float)
+    if entradas.ndim == 1:
+        # una sola muestra, o ninguna (lista vacía)
+        entradas = entradas.reshape(1, -1) if entradas.size else entradas.reshape(0, n_inputs)
+    n, d = entradas.shape
+    X = np.empty((n, d + 1))
+    X[:, :d] = entradas
+    X[:, d] = 1.0
+    return X
+
+
+def lotes(n, tam_lote=None):
+    """Slices de `tam_lote` filas que recorren n filas (uno solo si tam_lote es None)."""
+    paso = tam_lote or max(n, 1)  # n == 0: range no acepta paso 0
+    for inicio in range(0, n, paso):
+        yield slice(inicio, inicio + paso)
+
+
+class CriterioParada:
+    """
+    Decide cuándo dejar de entrenar, época por época.
+
+    Motivos de parada:
+    - "convergencia": el error total llegó a 0.
+    - "sin_mejora": el error no bajó durante `paciencia` épocas seguidas.
+    - "tiempo": se superó el presupuesto de `tiempo_max` segundos, contados
+      desde iniciar() (o desde el primer actualizar() si nadie lo llamó).
+    """
+    def __init__(self, paciencia=None, tiempo_max=None):
+        self.paciencia = paciencia
+        self.tiempo_max = tiempo_max
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.epocas = 0
+        self.mejor_error = None
+        self.epocas_sin_mejora = 0
+        self.motivo = None
+        self.inicio = None
+
+    def iniciar(self):
+        """Arranca el reloj de `tiempo_max` si todavía no corre."""
+        if self.inicio is None:
+            self.inicio = time.perf_counter()
+        return self
+
+    def actualizar(self, error):
+        """Registra el error de una época; devuelve el motivo de parada o None."""
+        self.iniciar()
+        self.epocas += 1
+        if self.mejor_error is None or error < self.mejor_error:
+            self.mejor_error = error
+            self.epocas_sin_mejora = 0
+        else:
+            self.epocas_sin_mejora += 1
+
+        if error == 0:
+            self.motivo = "convergencia"
+        elif self.paciencia is not None and self.epocas_sin_mejora >= self.paciencia:
+            self.motivo = "sin_mejora"
+        elif self.tiempo_max is not None and time.perf_counter() - self.inicio >= self.tiempo_max:
+            self.motivo = "tiempo"
+        return self.motivo
+
 
 class PerceptronAgent:
-    def __init__(self, n_inputs=2, tasa_aprendizaje=0.1, iteraciones=100):
+    def __init__(self, n_inputs=2, tasa_aprendizaje=0.1, iteraciones=100, semilla=None, rng=None,
+                 checkpoint=None):
         """
         Crea un perceptrón con pesos aleatorios, tasa de aprendizaje y número de iteraciones.
+        Los pesos salen de `rng` (random.Random o np.random.Generator), de una
+        semilla, o del módulo random global si no se da ninguno.
+
+        Con `checkpoint` (ruta o Checkpoint, ver checkpoint.py) arranca desde
+        lo guardado: pesos, tasa e historial de errores; si además se pasa
+        `rng`, se restaura su estado.
         """
+        self.iteraciones = iteraciones
+        self.epocas = 0
+        self.motivo_parada = None
+        ck = como_checkpoint(checkpoint)
+        if ck is not None:
+            if ck.pesos.shape != (n_inputs + 1,):
+                raise ValueError(f"El checkpoint tiene pesos de forma {ck.pesos.shape}")
+            self.pesos = ck.pesos.tolist()
+            self.tasa = ck.tasa
+            self.errores = ck.errores.tolist()
+            self.epocas = int(ck.meta.get("epocas", 0))
+            if rng is not None and "rng" in ck.rngs:
+                restaurar_rng(rng, ck.rngs["rng"])
+            return
+
+        if rng is None:
+            rng = random.Random(semilla) if semilla is not None else random
         # +1 para el sesgo (bias)
-        self.pesos = [random.uniform(-1, 1) for _ in range(n_inputs + 1)]
+        self.pesos = [float(rng.uniform(-1, 1)) for _ in range(n_inputs + 1)]
         self.tasa = tasa_aprendizaje
-        self.iteraciones = iteraciones
+        self.errores = []
+
+    def guardar(self, ruta, rng=None):
+        """Guarda pesos, tasa, errores (y el estado de `rng` si se da) en `ruta`."""
+        guardar_checkpoint(ruta, self.pesos, self.tasa, self.errores,
+                           rngs={"rng": rng} if rng is not None else None, epocas=self.epocas)
         
     def predecir(self, entradas):
         """
@@ -37,4 +144,90 @@ class PerceptronAgent:
                 entrada = entradas[i] if i < len(entradas) else 1
                 self.pesos[i] += self.tasa * error * entrada
 
-        return error_total
\ No newline at end of file
+        return error_total
+
+    def entrenar_hasta_converger(self, datos, paciencia=None, tiempo_max=None):
+        """
+        Entrena hasta `self.iteraciones` épocas, pero para antes si converge,
+        si deja de mejorar o si se acaba el tiempo (ver CriterioParada).
+        Devuelve (epocas de esta llamada, motivo); el motivo es "iteraciones"
+        si llegó al máximo. self.epocas lleva el total, checkpoint incluido.
+        """
+        criterio = CriterioParada(paciencia, tiempo_max).iniciar()
+        motivo = None
+        while criterio.epocas < self.iteraciones and motivo is None:
+            error = self.entrenar(datos)
+            self.errores.append(error)
+            motivo = criterio.actualizar(error)
+
+        self.epocas += criterio.epocas  # acumula sobre lo que trajo el checkpoint
+        self.motivo_parada = motivo or "iteraciones"
+        return criterio.epocas, self.motivo_parada
+
+    # ---- entrenamiento por bloques (datos fuera de memoria) ----
+    def entrenar_parcial(self, bloque, etiquetas=None, tam_lote=None):
+        """
+        Al estilo partial_fit: actualiza los pesos con un bloque de filas
+        [x_1, ..., x_n, etiqueta] (o con X y `etiquetas` por separado) usando
+        NumPy en lugar de un ciclo por punto. Dentro de cada lote de
+        `tam_lote` filas (todo el bloque si es None) las correcciones se
+        calculan con los mismos pesos y se suman; con tam_lote=1 es la regla
+        de entrenar(). Devuelve el error del bloque, en la escala de entrenar().
+        """
+        bloque = np.asarray(bloque)
+        if etiquetas is None:
+            X, y = bloque[:, :-1], bloque[:, -1]
+        else:
+            X, y = bloque, np.asarray(etiquetas)
+        if X.shape[1] != len(self.pesos) - 1:
+            raise ValueError(f"Se esperaban {len(self.pesos) - 1} entradas por fila, llegaron {X.shape[1]}")
+
+        w = np.asarray(self.pesos, dtype=float)
+        error_total = 0
+        for lote in lotes(len(X), tam_lote):
+            Xl = np.asarray(X[lote], dtype=float)  # float32 del disco -> float64
+            E = y[lote] - np.where(Xl @ w[:-1] + w[-1] >= 0, 1.0, -1.0)
+            error_total += int(np.abs(E).sum())
+            w[:-1] += self.tasa * (E @ Xl)
+            w[-1] += self.tasa * E.sum()  # el bias ve siempre una entrada 1
+        self.pesos = w.tolist()
+        return error_total
+
+    def entrenar_flujo(self, fuente, tam_chunk=65536, tam_lote=None, paciencia=None, tiempo_max=None):
+        """
+        Entrena por épocas sin cargar todos los datos: recorre `fuente` de a
+        bloques con entrenar_parcial, así la memoria no depende del total.
+        `fuente` puede ser:
+        - la ruta de un archivo de generador.guardar_dataset (float32, se
+          abre con np.memmap y se lee de a `tam_chunk` filas),
+        - un arreglo o memmap de filas [x_1, ..., x_n, etiqueta],
+        - una función que devuelve los bloques de una época cada vez que se llama,
+        - cualquier iterable de bloques (p. ej. generar_puntos_stream); como
+          se consume una vez, se entrena una sola época.
+        Mismo criterio de parada y valor de retorno que entrenar_hasta_converger.
+        """
+        if isinstance(fuente, (str, os.PathLike)):
+            fuente = abrir_dataset(fuente, len(self.pesos))
+        max_epocas = self.iteraciones
+        if isinstance(fuente, np.ndarray):
+            datos = fuente
+
+            def bloques():
+                return (datos[i:i + tam_chunk] for i in range(0, len(datos), tam_chunk))
+        elif callable(fuente):
+            bloques = fuente
+        else:
+            def bloques():
+                return fuente
+            max_epocas = min(max_epocas, 1)
+
+        criterio = CriterioParada(paciencia, tiempo_max).iniciar()
+        motivo = None
+        while criterio.epocas < max_epocas and motivo is None:
+            error = sum(self.entrenar_parcial(b, tam_lote=tam_lote) for b in bloques())
+            self.errores.append(error)
+            motivo = criterio.actualizar(error)
+
+        self.epocas += criterio.epocas  # acumula sobre lo que trajo el checkpoint
+        self.motivo_parada = motivo or "iteraciones"
+        return criterio.epocas, self.motivo_parada
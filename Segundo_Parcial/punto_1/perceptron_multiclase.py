@@ -0,0 +1,112 @@
+import numpy as np
+
+from perceptron import CriterioParada, lotes, matriz_con_bias
+
+
+def proyectar_pesos(pesos, dims=(0, 1), fijos=None):
+    """
+    Reduce un vector de pesos [w_0, ..., w_{N-1}, b] a la recta (w_i, w_j, b')
+    del plano de las características `dims`, dejando las demás en `fijos`
+    (un vector de N valores; ceros si es None). Con N = 2 devuelve los
+    mismos pesos, así el dibujo de la línea en 2-D no cambia.
+    """
+    pesos = np.asarray(pesos, dtype=float)
+    w, b = pesos[:-1], pesos[-1]
+    i, j = dims
+    if fijos is not None:
+        resto = np.ones(len(w), dtype=bool)
+        resto[[i, j]] = False
+        b = b + float(np.dot(w[resto], np.asarray(fijos, dtype=float)[resto]))
+    return float(w[i]), float(w[j]), float(b)
+
+
+class PerceptronMulticlase:
+    """
+    Perceptrón de N características y K clases, uno contra el resto.
+
+    Los K vectores de pesos son las filas de una matriz W de (K, N + 1) (el
+    bias va en la última columna) y se entrenan juntos: en cada lote se
+    calculan todas las salidas con un producto de matrices y W se actualiza
+    con otro, sin ciclos de Python por muestra ni por clase. Cada clase
+    aprende a responder +1 para sus muestras y -1 para las demás, y la
+    predicción es la clase con mayor puntaje.
+    """
+    def __init__(self, n_caracteristicas, clases, tasa_aprendizaje=0.1, iteraciones=100,
+                 semilla=None, rng=None):
+        self.clases = np.unique(np.asarray(clases))
+        if len(self.clases) < 2:
+            raise ValueError("Se necesitan al menos dos clases")
+        if rng is None:
+            rng = np.random.default_rng(semilla)
+        self.n_caracteristicas = n_caracteristicas
+        self.W = rng.uniform(-1, 1, (len(self.clases), n_caracteristicas + 1))
+        self.tasa = tasa_aprendizaje
+        self.iteraciones = iteraciones
+        self.errores = []
+        self.epocas = 0
+        self.motivo_parada = None
+
+    # ---- predicción ----
+    def puntajes(self, X):
+        """Puntaje de cada clase para cada fila de X (sin bias): (n, K)."""
+        return matriz_con_bias(X, self.n_caracteristicas) @ self.W.T
+
+    def predecir(self, X):
+        """Etiqueta de la clase con mayor puntaje para cada fila de X."""
+        return self.clases[np.argmax(self.puntajes(X), axis=1)]
+
+    def exactitud(self, X, y):
+        return float(np.mean(self.predecir(X) == np.asarray(y)))
+
+    # ---- entrenamiento ----
+    def objetivos(self, y):
+        """Etiquetas (n,) -> matriz (n, K) de +1 / -1, una columna por clase."""
+        y = np.asarray(y)
+        if not np.isin(y, self.clases).all():
+            raise ValueError("Hay etiquetas que no están en `clases`")
+        return np.where(y[:, None] == self.clases[None, :], 1.0, -1.0)
+
+    def entrenar_epoca(self, Xb, T, tam_lote=None):
+        """
+        Una época sobre Xb (con bias) y los objetivos T (ver objetivos()).
+        Devuelve el error total: suma de |objetivo - salida| sobre las K
+        salidas, igual que el perceptrón binario (2 por salida equivocada).
+        """
+        error_total = 0
+        for lote in lotes(Xb.shape[0], tam_lote):
+            Xl = Xb[lote]
+            E = T[lote] - np.where(Xl @ self.W.T >= 0, 1.0, -1.0)
+            error_total += int(np.abs(E).sum())
+            self.W += self.tasa * (E.T @ Xl)
+        self.errores.append(error_total)
+        return error_total
+
+    def entrenar(self, X, y, paciencia=None, tiempo_max=None, tam_lote=None):
+        """
+        Entrena hasta `self.iteraciones` épocas con parada temprana (ver
+        CriterioParada). El bias y los objetivos se arman una sola vez.
+        Devuelve (epocas de esta llamada, motivo); el motivo es "iteraciones"
+        si llegó al máximo. self.epocas lleva el total entre llamadas.
+        """
+        Xb = matriz_con_bias(X, self.n_caracteristicas)
+        T = self.objetivos(y)
+        criterio = CriterioParada(paciencia, tiempo_max).iniciar()
+        motivo = None
+        while criterio.epocas < self.iteraciones and motivo is None:
+            motivo = criterio.actualizar(self.entrenar_epoca(Xb, T, tam_lote))
+
+        self.epocas += criterio.epocas  # total entre llamadas
+        self.motivo_parada = motivo or "iteraciones"
+        return criterio.epocas, self.motivo_parada
+
+    # ---- visualización ----
+    def pesos_clase(self, clase):
+        """Vector de pesos (con bias) de una clase, p. ej. para dibujar su línea."""
+        i = int(np.searchsorted(self.clases, clase))
+        if i >= len(self.clases) or self.clases[i] != clase:
+            raise ValueError(f"Clase desconocida: {clase}")
+        return self.W[i]
+
+    def linea_2d(self, clase, dims=(0, 1), fijos=None):
+        """Recta (w_i, w_j, b) de la clase proyectada al plano `dims` (ver proyectar_pesos)."""
+        return proyectar_pesos(self.pesos_clase(clase), dims, fijos)
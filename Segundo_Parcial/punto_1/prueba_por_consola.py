@@ -1,15 +1,28 @@
 from generador import generar_puntos
 from perceptron import PerceptronAgent
-import random
+import numpy as np
+import os
+import sys
+
+# Opcional: python prueba_por_consola.py pesos.ckpt
+# Si el archivo existe se retoma desde esos pesos (con su historial de
+# errores y el estado del generador); al terminar se guardan ahí.
+ruta_checkpoint = sys.argv[1] if len(sys.argv) > 1 else None
+retomar = ruta_checkpoint is not None and os.path.exists(ruta_checkpoint)
+
+# Un solo generador para pesos, puntos y mezcla: al retomar sigue desde el
+# estado guardado en el checkpoint
+rng = np.random.default_rng()
+n = PerceptronAgent(2, 0.1, 10, rng=rng, checkpoint=ruta_checkpoint if retomar else None)
 
 # Generar puntos (lista mezclada con [x, y, etiqueta])
-puntos = generar_puntos(10)
+puntos = generar_puntos(10, rng=rng)
 
 # Separar por etiqueta para imprimir bonitos
 rojos = [p for p in puntos if p[2] == 1]
 azules = [p for p in puntos if p[2] == -1]
 
-random.shuffle(puntos)
+puntos = [puntos[i] for i in rng.permutation(len(puntos))]
 
 print("puntos rojos:")
 for p in rojos:
@@ -25,14 +38,21 @@ for p in puntos:
 
 # Crear perceptrón "puro" (no Mesa)
 print("\nentrenando perceptron...\n")
-n = PerceptronAgent(2, 0.1, 10)
+if retomar:
+    print("retomando desde", ruta_checkpoint, "después de", n.epocas, "épocas")
 
 for i in range(n.iteraciones):
     err = n.entrenar(puntos)
-    print("iteracion", i+1, "error total:", err)
+    # Historial y épocas van al checkpoint junto con los pesos
+    n.errores.append(err)
+    n.epocas += 1
+    print("iteracion", n.epocas, "error total:", err)
 
 print("\npesos finales:")
 print(n.pesos)
+if ruta_checkpoint:
+    n.guardar(ruta_checkpoint, rng=rng)
+    print("pesos guardados en", ruta_checkpoint)
 
 # Probar punto manual
 print("\nprobar punto nuevo:")
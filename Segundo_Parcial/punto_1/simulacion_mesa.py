@@ -6,21 +6,28 @@
 from mesa import Agent, Model
 from mesa.space import MultiGrid
 from mesa.time import RandomActivation
-from mesa.visualization.modules import CanvasGrid, ChartModule
-from mesa.visualization.ModularVisualization import ModularServer
-from mesa.visualization.UserParam import Slider
 from mesa.datacollection import DataCollector
-from generador import generar_puntos
-import random
+from generador import generar_puntos, generar_puntos_array
+from perceptron import CriterioParada, lotes, matriz_con_bias
+from checkpoint import como_checkpoint, guardar_checkpoint, restaurar_rng
+from perceptron_multiclase import proyectar_pesos
+import rutas
+rutas.agregar_comun()
+from colector import ColectorAnillo
+from instrumentacion import fase, instrumentado
 import numpy as np
 
 # --------------------------------------------------------
 # 1️⃣ Perceptrón "dentro" de Mesa (entrenamiento)
 # --------------------------------------------------------
 class PerceptronAgent(Agent):
-    def __init__(self, unique_id, model, n_inputs=2, tasa_aprendizaje=0.1):
+    MODOS = ("muestra", "lote")
+
+    def __init__(self, unique_id, model, n_inputs=2, tasa_aprendizaje=0.1, rng=None):
         super().__init__(unique_id, model)
-        self.pesos = np.random.rand(n_inputs + 1)  # +1 bias
+        # Pesos iniciales desde el generador del modelo (o el de NumPy global)
+        rng = rng if rng is not None else getattr(model, "rng", None)
+        self.pesos = rng.random(n_inputs + 1) if rng is not None else np.random.rand(n_inputs + 1)  # +1 bias
         self.tasa_aprendizaje = tasa_aprendizaje
         self.errores = []
 
@@ -29,18 +36,62 @@ class PerceptronAgent(Agent):
         suma = np.dot(self.pesos, inputs_con_bias)
         return 1 if suma >= 0 else -1
 
+    def predecir_lote(self, X):
+        """
+        Predice todas las filas de X (ya con bias) en una sola operación.
+        Devuelve un arreglo de 1 / -1.
+        """
+        return np.where(X @ self.pesos >= 0, 1, -1)
+
     def entrenar(self, datos_entrenamiento):
-        error_total = 0
-        for inputs, objetivo in datos_entrenamiento:
-            prediccion = self.predict(inputs)
-            error = objetivo - prediccion
-            error_total += abs(error)
-            inputs_con_bias = np.append(inputs, 1)
-            self.pesos += self.tasa_aprendizaje * error * inputs_con_bias
+        if not datos_entrenamiento:
+            self.errores.append(0)
+            return 0
+        entradas, objetivos = zip(*datos_entrenamiento)
+        return self.entrenar_matriz(matriz_con_bias(entradas), np.asarray(objetivos))
+
+    def entrenar_matriz(self, X, y, modo="muestra", tam_lote=None):
+        """
+        Entrena una época sobre la matriz X (con bias) y las etiquetas y.
+
+        - modo="muestra": regla clásica muestra por muestra (mismo resultado
+          bit a bit que recorrer la lista de tuplas).
+        - modo="lote": la época se procesa en lotes de `tam_lote` filas
+          (toda la matriz si es None) con operaciones vectorizadas.
+        """
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de entrenamiento desconocido: {modo}")
+
+        if modo == "muestra":
+            error_total = 0
+            for fila, objetivo in zip(X, y.tolist()):
+                prediccion = 1 if np.dot(self.pesos, fila) >= 0 else -1
+                error = objetivo - prediccion
+                error_total += abs(error)
+                self.pesos += self.tasa_aprendizaje * error * fila
+        else:
+            error_total = 0
+            for lote in lotes(X.shape[0], tam_lote):
+                Xb = X[lote]
+                errores = y[lote] - self.predecir_lote(Xb)
+                error_total += int(np.abs(errores).sum())
+                self.pesos += self.tasa_aprendizaje * (errores @ Xb)
 
         self.errores.append(error_total)
         return error_total
 
+    def entrenar_hasta_converger(self, X, y, iteraciones, paciencia=None, tiempo_max=None,
+                                 modo="muestra", tam_lote=None):
+        """
+        Entrena hasta `iteraciones` épocas con parada temprana (ver CriterioParada).
+        Devuelve (epocas, motivo); el motivo es "iteraciones" si llegó al máximo.
+        """
+        criterio = CriterioParada(paciencia, tiempo_max).iniciar()
+        motivo = None
+        while criterio.epocas < iteraciones and motivo is None:
+            motivo = criterio.actualizar(self.entrenar_matriz(X, y, modo, tam_lote))
+        return criterio.epocas, motivo or "iteraciones"
+
     def step(self):
         pass
 
@@ -58,58 +109,139 @@ class LineaPunto(Agent):
 # 2️⃣ Agentes visuales (puntos de datos)
 # --------------------------------------------------------
 class PuntoAgent(Agent):
-    def __init__(self, unique_id, model, clase):
+    def __init__(self, unique_id, model, clase, indice=None):
         super().__init__(unique_id, model)
         self.clase = clase
+        self.indice = unique_id if indice is None else indice
         self.correcto = None
 
+    @instrumentado
     def step(self):
-        perceptron = self.model.perceptron
-        inputs = np.array(self.pos)
-        prediccion = perceptron.predict(inputs)
-        self.correcto = (prediccion == self.clase)
+        # El modelo predice todos los puntos de una vez antes del tick
+        prediccion = self.model.predicciones[self.indice]
+        self.correcto = bool(prediccion == self.clase)
 
 # --------------------------------------------------------
 # 3️⃣ Modelo de simulación
 # --------------------------------------------------------
 class Simulacion(Model):
-    def __init__(self, cantidad_por_clase=10, tasa=0.1, iteraciones=10):
+    """
+    Con modo_puntos="agentes" cada punto es un PuntoAgent (modo original).
+    Con modo_puntos="arreglos" los puntos viven en arreglos de NumPy
+    (puntos_pos, puntos_clase, puntos_correcto) sin un agente por punto, lo
+    que permite simular cientos de miles de puntos.
+
+    Con capacidad_historial o intervalo_muestreo > 1 la serie "Error" se
+    guarda en un ColectorAnillo (memoria acotada) en vez del DataCollector.
+
+    Con `instrumentacion` (una Instrumentacion) cada paso se desglosa en
+    entrenar / collect / dibujar_linea / predecir / schedule.
+
+    Con `checkpoint` (ruta o Checkpoint) el perceptrón arranca con los pesos,
+    la tasa y el historial guardados por guardar(), y los generadores del
+    modelo siguen desde donde quedaron: con la misma semilla, cortar una
+    corrida y retomarla da los mismos pesos que hacerla de una vez.
+    """
+    MODOS_PUNTOS = ("agentes", "arreglos")
+
+    def __init__(self, cantidad_por_clase=10, tasa=0.1, iteraciones=10,
+                 modo_entrenamiento="muestra", tam_lote=None,
+                 tam_grid=20, planificador=RandomActivation,
+                 paciencia=None, tiempo_max=None, modo_puntos="agentes",
+                 capacidad_historial=None, intervalo_muestreo=1, directorio_volcado=None,
+                 *, seed=None, instrumentacion=None, checkpoint=None):
+        if modo_puntos not in self.MODOS_PUNTOS:
+            raise ValueError(f"Modo de puntos desconocido: {modo_puntos}")
+        # Mesa siembra self.random con `seed` (RandomActivation lo usa); de ahí
+        # sale el generador de NumPy para los puntos, los pesos y la mezcla.
         super().__init__()
-        self.schedule = RandomActivation(self)
-        self.grid = MultiGrid(20, 20, True)
+        self.rng = np.random.default_rng(self.random.getrandbits(64))
+        self.instrumentacion = instrumentacion
+        self.schedule = planificador(self)
+        self.grid = MultiGrid(tam_grid, tam_grid, True)
         self.iteraciones = iteraciones
         self.tasa = tasa
         self.cantidad_por_clase = cantidad_por_clase
+        self.modo_entrenamiento = modo_entrenamiento
+        self.tam_lote = tam_lote
+        self.modo_puntos = modo_puntos
         self.current_step = 0
         self.running = True
+        # Parada temprana: se termina apenas converge el entrenamiento. El reloj
+        # de tiempo_max arranca en el primer step, no al construir el modelo
+        self.criterio = CriterioParada(paciencia, tiempo_max)
+        self.motivo_parada = None
+        self.epoca_convergencia = None
 
         # Perceptrón "entrenador"
-        self.perceptron = PerceptronAgent("perceptron", self, tasa_aprendizaje=tasa)
+        self.perceptron = PerceptronAgent("perceptron", self, tasa_aprendizaje=tasa, rng=self.rng)
         self.schedule.add(self.perceptron)
 
         # Puntos de datos
         self.crear_entorno()
 
+        ck = como_checkpoint(checkpoint)
+        if ck is not None:
+            self._cargar_checkpoint(ck)
+
         # Data collector
         self.error_actual = 0
-        self.datacollector = DataCollector(
-            model_reporters={"Error": "error_actual"}
-        )
+        if capacidad_historial is None and intervalo_muestreo == 1:
+            self.datacollector = DataCollector(
+                model_reporters={"Error": "error_actual"}
+            )
+        else:
+            self.datacollector = ColectorAnillo(
+                {"Error": "error_actual"}, capacidad=capacidad_historial or 10000,
+                intervalo=intervalo_muestreo, directorio_volcado=directorio_volcado
+            )
 
-        # Para controlar los agentes de la línea
+        # Para controlar los agentes de la línea: se reutilizan entre pasos
+        self._line_agents = []
         self._line_agents_ids = set()
         self._next_line_id = 100000  # id alto para no chocar con puntos
+        self._pesos_dibujados = None
 
     def crear_entorno(self):
-        puntos = generar_puntos(self.cantidad_por_clase, rango_x=(0, 19), rango_y=(0, 19), ruido=0.0)
+        if self.modo_puntos == "arreglos":
+            self._crear_puntos_arreglos()
+            return
+        limite = self.grid.width - 1
+        puntos = generar_puntos(self.cantidad_por_clase, rango_x=(0, limite), rango_y=(0, limite),
+                                ruido=0.0, rng=self.rng)
+        self.puntos = []
         for i, (x, y, clase) in enumerate(puntos):
             agente = PuntoAgent(i, self, clase)
             x_pos = max(0, min(self.grid.width - 1, int(round(x))))
             y_pos = max(0, min(self.grid.height - 1, int(round(y))))
             self.grid.place_agent(agente, (x_pos, y_pos))
             self.schedule.add(agente)
+            self.puntos.append(agente)
+        # Posiciones de todos los puntos (con bias) para predecir en lote
+        self.X_puntos = matriz_con_bias([ag.pos for ag in self.puntos])
+        self.predicciones = np.zeros(len(self.puntos), dtype=int)
         self.preparar_datos_entrenamiento()
 
+    def _crear_puntos_arreglos(self):
+        """Puntos como estructura de arreglos: posición, clase y acierto."""
+        datos = generar_puntos_array(self.cantidad_por_clase, rango_x=(0, self.grid.width - 1),
+                                     rango_y=(0, self.grid.height - 1), ruido=0.0, rng=self.rng)
+        pos = np.rint(datos[:, :2]).astype(int)
+        pos[:, 0] = np.clip(pos[:, 0], 0, self.grid.width - 1)
+        pos[:, 1] = np.clip(pos[:, 1], 0, self.grid.height - 1)
+        self.puntos = None
+        self.puntos_pos = pos
+        self.puntos_clase = datos[:, 2].astype(int)
+        self.puntos_correcto = np.full(len(datos), -1, dtype=np.int8)  # -1: sin evaluar
+        self.X_puntos = matriz_con_bias(pos)
+        self.predicciones = np.zeros(len(datos), dtype=int)
+
+        # No hay lista de tuplas: se entrena directo sobre la matriz mezclada
+        orden = self.rng.permutation(len(datos))
+        self.datos_entrenamiento = None
+        self.X_entrenamiento = self.X_puntos[orden]
+        self.y_entrenamiento = self.puntos_clase[orden]
+
     def preparar_datos_entrenamiento(self):
         self.datos_entrenamiento = []
         for agent in self.schedule.agents:
@@ -118,12 +250,42 @@ class Simulacion(Model):
                 inputs = np.array([x, y])
                 objetivo = agent.clase
                 self.datos_entrenamiento.append((inputs, objetivo))
-        random.shuffle(self.datos_entrenamiento)
+        self.random.shuffle(self.datos_entrenamiento)
+
+        # Misma información como matriz contigua: el bias se calcula una sola vez
+        if self.datos_entrenamiento:
+            entradas, objetivos = zip(*self.datos_entrenamiento)
+        else:
+            entradas, objetivos = np.empty((0, 2)), ()
+        self.X_entrenamiento = matriz_con_bias(entradas)
+        self.y_entrenamiento = np.asarray(objetivos, dtype=int)
+
+    # ---- checkpoints ----
+    def _cargar_checkpoint(self, ck):
+        if ck.pesos.shape != self.perceptron.pesos.shape:
+            raise ValueError(f"El checkpoint tiene pesos de forma {ck.pesos.shape}")
+        self.perceptron.pesos = np.array(ck.pesos)  # copia: el memmap es de solo lectura
+        self.tasa = self.perceptron.tasa_aprendizaje = ck.tasa
+        self.perceptron.errores = ck.errores.tolist()
+        for nombre, generador in (("rng", self.rng), ("random", self.random)):
+            if nombre in ck.rngs:
+                restaurar_rng(generador, ck.rngs[nombre])
+
+    def guardar(self, ruta):
+        """Guarda el estado del perceptrón y de los generadores del modelo."""
+        guardar_checkpoint(ruta, self.perceptron.pesos, self.perceptron.tasa_aprendizaje,
+                           self.perceptron.errores, rngs={"rng": self.rng, "random": self.random},
+                           epocas=self.current_step)
 
     # ---- helpers para la línea ----
-    def _coords_linea_decision(self):
+    def _coords_linea_decision(self, pesos=None):
+        """
+        Celdas de la recta w1*x + w2*y + b = 0. Con más de dos entradas (o
+        con los pesos de una clase del perceptrón multiclase) se dibuja la
+        proyección sobre las dos primeras características.
+        """
         coords = []
-        w1, w2, b = self.perceptron.pesos
+        w1, w2, b = proyectar_pesos(self.perceptron.pesos if pesos is None else pesos)
         if abs(w2) < 1e-9:
             return coords  # evito división por cero
         for x in range(self.grid.width):
@@ -132,45 +294,66 @@ class Simulacion(Model):
                 coords.append((x, y))
         return coords
 
-    def _limpiar_linea(self):
-        # Eliminar agentes de línea existentes
-        to_remove = []
-        for ag in list(self.schedule.agents):
-            if isinstance(ag, LineaPunto):
-                to_remove.append(ag)
-        for ag in to_remove:
-            # sacar del grid y del scheduler
-            for cell in list(self.grid.coord_iter()):
-                cell_content, x, y = cell
-                if ag in cell_content:
-                    self.grid.remove_agent(ag)
-                    break
-            self.schedule.remove(ag)
-        self._line_agents_ids.clear()
-
     def _dibujar_linea(self):
-        self._limpiar_linea()
-        for (x, y) in self._coords_linea_decision():
+        pesos = self.perceptron.pesos
+        if self._pesos_dibujados is not None and np.array_equal(pesos, self._pesos_dibujados):
+            return  # los pesos no cambiaron en la época: la línea es la misma
+        self._pesos_dibujados = pesos.copy()
+
+        coords = self._coords_linea_decision()
+        # Mover los agentes que ya existen a las nuevas posiciones
+        for ag, pos in zip(self._line_agents, coords):
+            if ag.pos != pos:
+                self.grid.move_agent(ag, pos)
+        # Agregar o quitar solo si cambió el largo de la línea
+        for pos in coords[len(self._line_agents):]:
             lp = LineaPunto(self._next_line_id, self)
             self._next_line_id += 1
-            self.grid.place_agent(lp, (x, y))
+            self.grid.place_agent(lp, pos)
             self.schedule.add(lp)
+            self._line_agents.append(lp)
             self._line_agents_ids.add(lp.unique_id)
+        while len(self._line_agents) > len(coords):
+            ag = self._line_agents.pop()
+            self.grid.remove_agent(ag)
+            self.schedule.remove(ag)
+            self._line_agents_ids.discard(ag.unique_id)
 
     def step(self):
         if self.current_step < self.iteraciones:
+            self.criterio.iniciar()
+            inst = self.instrumentacion
             # Entrenar
-            error_total = self.perceptron.entrenar(self.datos_entrenamiento)
+            with fase(inst, "entrenar"):
+                error_total = self.perceptron.entrenar_matriz(
+                    self.X_entrenamiento, self.y_entrenamiento,
+                    modo=self.modo_entrenamiento, tam_lote=self.tam_lote
+                )
             self.error_actual = error_total
-            self.datacollector.collect(self)
+            with fase(inst, "collect"):
+                self.datacollector.collect(self)
+            motivo = self.criterio.actualizar(error_total)
 
             # Redibujar la línea de decisión
-            self._dibujar_linea()
+            with fase(inst, "dibujar_linea"):
+                self._dibujar_linea()
 
             # Actualizar colores de puntos (y otros agentes visuales) en el tick
-            self.schedule.step()
+            with fase(inst, "predecir"):
+                self.predicciones = self.perceptron.predecir_lote(self.X_puntos)
+                if self.modo_puntos == "arreglos":
+                    self.puntos_correcto = (self.predicciones == self.puntos_clase).astype(np.int8)
+            with fase(inst, "schedule"):
+                self.schedule.step()
 
             self.current_step += 1
+            if motivo is None and self.current_step >= self.iteraciones:
+                motivo = "iteraciones"
+            if motivo is not None:
+                self.motivo_parada = motivo
+                if motivo == "convergencia":
+                    self.epoca_convergencia = self.current_step
+                self.running = False
         else:
             self.running = False
 
@@ -209,11 +392,60 @@ def agente_portrayer(agent):
 
     return portrayal
 
+def agregar_puntos_arreglos(model, grid_state):
+    """
+    Agrega al estado de la grilla los puntos guardados en arreglos
+    (modo_puntos="arreglos"): un círculo por celda ocupada, verde si todos
+    sus puntos están bien clasificados, rojo si ninguno y naranja si hay de
+    los dos.
+    """
+    if getattr(model, "modo_puntos", "agentes") != "arreglos":
+        return grid_state
+
+    ancho = model.grid.width
+    celdas = model.puntos_pos[:, 0] * model.grid.height + model.puntos_pos[:, 1]
+    total = np.bincount(celdas, minlength=ancho * model.grid.height)
+    aciertos = np.bincount(celdas, weights=(model.puntos_correcto == 1),
+                           minlength=ancho * model.grid.height)
+    evaluado = bool((model.puntos_correcto >= 0).all())
+    for celda in np.flatnonzero(total):
+        if not evaluado:
+            color = "gray"
+        elif aciertos[celda] == total[celda]:
+            color = "green"
+        elif aciertos[celda] == 0:
+            color = "red"
+        else:
+            color = "orange"
+        grid_state[0].append({
+            "Shape": "circle", "r": 0.5, "Filled": "true", "Layer": 0, "Color": color,
+            "x": int(celda // model.grid.height), "y": int(celda % model.grid.height),
+        })
+    return grid_state
+
 # --------------------------------------------------------
 # 5️⃣ Configuración de la visualización
 # --------------------------------------------------------
-def ejecutar_visualizacion():
-    grid = CanvasGrid(agente_portrayer, 20, 20, 500, 500)
+def ejecutar_visualizacion(delta=False, pasos_por_frame=1, fps_max=None):
+    """
+    Con delta=True usa ServidorDelta: la grilla manda solo los puntos que
+    cambiaron y cada frame corre `pasos_por_frame` pasos (o más, hasta
+    respetar `fps_max`). El gráfico de error queda con un punto por frame.
+
+    Los módulos de visualización se importan recién acá, así el modelo se
+    puede usar sin interfaz (cli.py, barrido, benchmarks) sin cargarlos.
+    """
+    from mesa.visualization.modules import CanvasGrid, ChartModule
+    from mesa.visualization.ModularVisualization import ModularServer
+    from mesa.visualization.UserParam import Slider
+    from visualizacion_delta import ElementoDelta, ServidorDelta
+
+    class CanvasPuntos(CanvasGrid):
+        """CanvasGrid que además dibuja los puntos en arreglos (ver agregar_puntos_arreglos)."""
+        def render(self, model):
+            return agregar_puntos_arreglos(model, super().render(model))
+
+    grid = CanvasPuntos(agente_portrayer, 20, 20, 500, 500)
     chart = ChartModule(
         [{"Label": "Error", "Color": "red"}],
         data_collector_name='datacollector'
@@ -225,12 +457,22 @@ def ejecutar_visualizacion():
         "iteraciones": Slider("Iteraciones de entrenamiento", 10, 1, 100, 1)
     }
 
-    server = ModularServer(
-        Simulacion,
-        [grid, chart],
-        "Simulación Perceptrón con Mesa",
-        model_params
-    )
+    if delta:
+        server = ServidorDelta(
+            Simulacion,
+            [ElementoDelta(grid, por_portrayal=True), chart],
+            "Simulación Perceptrón con Mesa",
+            model_params,
+            pasos_por_frame=pasos_por_frame,
+            fps_max=fps_max
+        )
+    else:
+        server = ModularServer(
+            Simulacion,
+            [grid, chart],
+            "Simulación Perceptrón con Mesa",
+            model_params
+        )
     server.port = 8521
     server.launch()
 
@@ -0,0 +1,36 @@
+import numpy as np
+
+from generador import generar_puntos, generar_puntos_multiclase
+from perceptron import PerceptronAgent
+from perceptron_multiclase import PerceptronMulticlase
+
+
+def test_retomar_suma_las_epocas(tmp_path):
+    ruta = str(tmp_path / "pesos.ckpt")
+    puntos = generar_puntos(20, semilla=3)
+
+    p = PerceptronAgent(2, 0.1, 3, semilla=3)
+    assert p.entrenar_hasta_converger(puntos)[0] == 3
+    p.guardar(ruta)
+
+    q = PerceptronAgent(2, 0.1, 2, checkpoint=ruta)
+    assert q.epocas == 3
+    epocas, _ = q.entrenar_hasta_converger(puntos)
+    assert (epocas, q.epocas, len(q.errores)) == (2, 5, 5)
+
+    q.guardar(ruta)
+    assert PerceptronAgent(2, checkpoint=ruta).epocas == 5
+
+
+def test_flujo_y_multiclase_acumulan_epocas():
+    datos = np.array(generar_puntos(20, semilla=1), dtype=float)
+    p = PerceptronAgent(2, 0.1, 2, semilla=1)
+    primera, _ = p.entrenar_flujo(datos)
+    segunda, _ = p.entrenar_flujo(datos)
+    assert p.epocas == primera + segunda
+
+    X, y = generar_puntos_multiclase(20, semilla=1)
+    m = PerceptronMulticlase(2, [0, 1, 2], iteraciones=2, semilla=1)
+    primera, _ = m.entrenar(X, y)
+    segunda, _ = m.entrenar(X, y)
+    assert m.epocas == primera + segunda
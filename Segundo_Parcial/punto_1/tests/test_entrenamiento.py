@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from generador import generar_puntos
+from perceptron import matriz_con_bias
+from simulacion_mesa import PerceptronAgent
+
+
+def _epoca_con_tuplas(pesos, tasa, datos):
+    """La regla original muestra por muestra sobre la lista de tuplas (inputs, objetivo)."""
+    error_total = 0
+    for inputs, objetivo in datos:
+        inputs_con_bias = np.append(inputs, 1)
+        prediccion = 1 if np.dot(pesos, inputs_con_bias) >= 0 else -1
+        error = objetivo - prediccion
+        error_total += abs(error)
+        pesos += tasa * error * inputs_con_bias
+    return error_total
+
+
+def _agente(semilla):
+    return PerceptronAgent(0, None, 2, 0.1, rng=np.random.default_rng(semilla))
+
+
+@pytest.mark.parametrize("semilla", [0, 1, 2])
+def test_modo_muestra_igual_bit_a_bit(semilla):
+    puntos = generar_puntos(30, semilla=semilla)
+    datos = [((x, y), e) for x, y, e in puntos]
+    X, y = matriz_con_bias([d[0] for d in datos]), np.array([d[1] for d in datos])
+
+    agente = _agente(semilla)
+    pesos = agente.pesos.copy()
+    for _ in range(10):
+        assert agente.entrenar_matriz(X, y, modo="muestra") == _epoca_con_tuplas(pesos, 0.1, datos)
+        assert np.array_equal(agente.pesos, pesos)
+
+
+def test_lote_de_una_fila_es_la_regla_por_muestra():
+    puntos = generar_puntos(30, semilla=4)
+    X, y = matriz_con_bias([p[:2] for p in puntos]), np.array([p[2] for p in puntos])
+    muestra, lote = _agente(4), _agente(4)
+    for _ in range(10):
+        assert (lote.entrenar_matriz(X, y, modo="lote", tam_lote=1)
+                == muestra.entrenar_matriz(X, y, modo="muestra"))
+        np.testing.assert_allclose(lote.pesos, muestra.pesos, rtol=1e-12)
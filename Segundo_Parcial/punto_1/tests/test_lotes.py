@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from perceptron import PerceptronAgent, lotes, matriz_con_bias
+from perceptron_multiclase import PerceptronMulticlase
+from simulacion_mesa import PerceptronAgent as PerceptronMesa
+
+
+def test_matriz_con_bias():
+    assert matriz_con_bias([]).shape == (0, 3)
+    assert matriz_con_bias([], 4).shape == (0, 5)
+    np.testing.assert_array_equal(matriz_con_bias([2, 3]), [[2, 3, 1]])
+    np.testing.assert_array_equal(matriz_con_bias([[1, 2], [3, 4]]), [[1, 2, 1], [3, 4, 1]])
+
+
+@pytest.mark.parametrize("n, tam_lote, largos", [
+    (0, None, []),
+    (0, 4, []),
+    (5, None, [5]),
+    (5, 2, [2, 2, 1]),
+])
+def test_lotes(n, tam_lote, largos):
+    assert [len(range(n)[s]) for s in lotes(n, tam_lote)] == largos
+
+
+def test_entrada_vacia_da_error_cero():
+    assert PerceptronAgent(2, semilla=1).entrenar_parcial(np.empty((0, 3))) == 0
+
+    m = PerceptronMulticlase(2, [0, 1], semilla=1)
+    assert m.entrenar_epoca(matriz_con_bias([], 2), m.objetivos(np.empty(0, dtype=int))) == 0
+    assert m.puntajes([]).shape == (0, 2)
+
+    ag = PerceptronMesa(0, None, 2, 0.1)
+    assert ag.entrenar_matriz(matriz_con_bias([]), np.empty(0), modo="lote", tam_lote=None) == 0
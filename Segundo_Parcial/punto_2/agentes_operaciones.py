@@ -1,72 +1,96 @@
-from dataclasses import dataclass
-from typing import Tuple, Optional
-from mesa import Agent
+from typing import Tuple
 
+import numpy as np
+from mesa import Agent
 
-@dataclass
-class Mensaje:
-    """Mensaje simple de petición/respuesta."""
-    tipo: str                 # 'request' o 'response'
-    operacion: str            # suma, resta, multiplicacion, division, potencia
-    operandos: Tuple[float, float] | None = None
-    resultado: Optional[float] = None
-    emisor: Optional[int] = None
-    receptor: Optional[int] = None
+from operaciones import FUNCIONES, Mensaje, MensajeLote, calcular_lote
+import rutas
+rutas.agregar_comun()
+from instrumentacion import instrumentado
 
 
 class OperacionAgente(Agent):
     """Agente base para operaciones binarias."""
     nombre_operacion = "operacion"
 
-    def __init__(self, unique_id, model):
+    def __init__(self, unique_id, model, capacidad: int = 1):
         super().__init__(unique_id, model)
         self.activo = False  # para resaltar cuando está procesando
+        # Mensajes que atiende por tick (1 deja la animación clara)
+        self.capacidad = capacidad
+        self.atendidos = 0
+        self.espera_total = 0  # ticks acumulados que esperaron los mensajes en cola
+        self.ticks_ocupado = 0  # ticks en que atendió al menos un mensaje
+        self.elementos_atendidos = 0  # pares de operandos (más de uno por MensajeLote)
 
     def calcular(self, a: float, b: float) -> float:
         raise NotImplementedError
 
+    @classmethod
+    def calcular_lote(cls, a, b) -> Tuple[np.ndarray, np.ndarray]:
+        """calcular elemento a elemento con NumPy (ver operaciones.calcular_lote)."""
+        return calcular_lote(cls.nombre_operacion, a, b)
+
+    @instrumentado
     def step(self):
         self.activo = False
-        # Consumir a lo sumo un mensaje por tick para que la animación sea clara
-        msg = self.model.recibir_mensaje(self.unique_id, esperado=self.nombre_operacion)
-        if msg is None:
-            return
+        for _ in range(self.capacidad):
+            msg = self.model.recibir_mensaje(self.unique_id, esperado=self.nombre_operacion)
+            if msg is None:
+                break
+            self.atender(msg)
+        if self.activo:
+            self.ticks_ocupado += 1
+
+    def atender(self, msg: Mensaje):
         a, b = msg.operandos
         self.activo = True
-        if self.nombre_operacion == "division" and b == 0:
-            raise ZeroDivisionError("División por cero")
-        r = self.calcular(a, b)
+        lote = isinstance(msg, MensajeLote)
+        if lote:
+            # Los errores van por elemento en la respuesta: no se lanza nada
+            r, errores = self.calcular_lote(a, b)
+            self.elementos_atendidos += r.size
+        else:
+            if self.nombre_operacion == "division" and b == 0:
+                raise ZeroDivisionError("División por cero")
+            r = self.calcular(a, b)
+            self.elementos_atendidos += 1
+        self.atendidos += 1
+        if msg.tick is not None:
+            self.espera_total += self.model.schedule.steps - msg.tick
         # Responder al emisor (el IO)
-        respuesta = Mensaje(
+        datos = dict(
             tipo="response",
             operacion=self.nombre_operacion,
             resultado=r,
             emisor=self.unique_id,
-            receptor=msg.emisor
+            receptor=msg.emisor,
+            correlacion=msg.correlacion
         )
+        respuesta = MensajeLote(**datos, errores=errores) if lote else Mensaje(**datos)
         self.model.enviar_mensaje(respuesta)
 
 
 class AgenteSuma(OperacionAgente):
     nombre_operacion = "suma"
-    def calcular(self, a, b): return a + b
+    calcular = staticmethod(FUNCIONES["suma"])
 
 
 class AgenteResta(OperacionAgente):
     nombre_operacion = "resta"
-    def calcular(self, a, b): return a - b
+    calcular = staticmethod(FUNCIONES["resta"])
 
 
 class AgenteMultiplicacion(OperacionAgente):
     nombre_operacion = "multiplicacion"
-    def calcular(self, a, b): return a * b
+    calcular = staticmethod(FUNCIONES["multiplicacion"])
 
 
 class AgenteDivision(OperacionAgente):
     nombre_operacion = "division"
-    def calcular(self, a, b): return a / b
+    calcular = staticmethod(FUNCIONES["division"])
 
 
 class AgentePotencia(OperacionAgente):
     nombre_operacion = "potencia"
-    def calcular(self, a, b): return a ** b
+    calcular = staticmethod(FUNCIONES["potencia"])
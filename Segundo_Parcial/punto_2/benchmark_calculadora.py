@@ -0,0 +1,185 @@
+# benchmark_calculadora.py — mide el modelo de la calculadora sin interfaz.
+#
+# Uso:
+#   python benchmark_calculadora.py --salida bench_calculadora.json
+#
+# Recorre expresiones cada vez más largas y más anidadas con cada planificador
+# y guarda tiempo por paso, pasos/seg y memoria pico en un JSON para
+# comparar entre commits. Con --traza además corre un caso
+# instrumentado, imprime el desglose por fase y guarda una traza de Chrome.
+# Con --latencia compara, en expresiones anchas, el modelo por ticks contra
+# el motor asyncio (motor_async.py) con esa latencia por operación.
+import argparse
+import asyncio
+import json
+import time
+
+from mesa.time import RandomActivation, SimultaneousActivation
+
+import rutas
+rutas.agregar_comun()
+from instrumentacion import Instrumentacion
+from medicion import memoria_pico, metadatos
+from modelo_calculadora import CalculadoraAgentesModel
+from motor_async import MotorAsync
+
+PLANIFICADORES = {
+    "SimultaneousActivation": SimultaneousActivation,
+    "RandomActivation": RandomActivation,
+}
+OPS = "+-*/"
+SEMILLA = 0  # misma corrida en cada commit
+
+
+def expresion_larga(n: int) -> str:
+    """n operadores en una sola cadena: 1 + 2 - 3 * 4 / 5 ..."""
+    partes = ["1"]
+    for i in range(n):
+        partes.append(OPS[i % len(OPS)])
+        partes.append(str(i % 9 + 1))
+    return " ".join(partes)
+
+
+def expresion_anidada(profundidad: int) -> str:
+    """((((1 + 2) * 3) - 4) ...) con `profundidad` niveles de paréntesis."""
+    expr = "1"
+    for i in range(profundidad):
+        expr = f"({expr} {OPS[i % len(OPS)]} {i % 9 + 1})"
+    return expr
+
+
+def expresion_ancha(niveles: int) -> str:
+    """Árbol balanceado de 2**niveles hojas: todas las ramas son independientes."""
+    hojas = [str(i % 9 + 1) for i in range(2 ** niveles)]
+    while len(hojas) > 1:
+        # Operadores alternados dentro de cada nivel, para repartir entre agentes
+        hojas = [f"({a} {OPS[j % len(OPS)]} {b})"
+                 for j, (a, b) in enumerate(zip(hojas[::2], hojas[1::2]))]
+    return hojas[0]
+
+
+def _correr(expr, planificador, max_pasos, modo_io="secuencial"):
+    modelo = CalculadoraAgentesModel(expr, planificador=planificador, seed=SEMILLA, modo_io=modo_io)
+    pasos = 0
+    while modelo.running and pasos < max_pasos:
+        modelo.step()
+        pasos += 1
+    return modelo, pasos
+
+
+def medir(expr: str, planificador, max_pasos: int = 100000, modo_io: str = "secuencial") -> dict:
+    # Primera pasada: solo tiempo (tracemalloc distorsiona los tiempos)
+    t0 = time.perf_counter()
+    modelo, pasos = _correr(expr, planificador, max_pasos, modo_io)
+    total = time.perf_counter() - t0
+
+    # Segunda pasada: memoria
+    pico = memoria_pico(_correr, expr, planificador, max_pasos, modo_io)
+
+    return {
+        "pasos": pasos,
+        "segundos": total,
+        "seg_por_paso": total / pasos if pasos else 0.0,
+        "pasos_por_seg": pasos / total if total else 0.0,
+        "memoria_pico_bytes": pico,
+        "resultado": modelo.io.resultado_final,
+        "error": modelo.io.error,
+    }
+
+
+def comparar_async(expr: str, latencia: float, capacidad: int = 1) -> dict:
+    """
+    Misma expresión en el modelo por ticks y en el motor asyncio. Con una
+    operación por tick, `pasos` es la latencia del modelo medida en
+    operaciones; en el motor se mide el tiempo real con `latencia` segundos
+    por operación y se lo compara con hacerlas una tras otra.
+    """
+    modelo, pasos = _correr(expr, SimultaneousActivation, 100000)
+
+    async def _motor():
+        async with MotorAsync(capacidad, latencia) as motor:
+            t0 = time.perf_counter()
+            r = await motor.evaluar(expr)
+            return r, time.perf_counter() - t0, motor.mensajes_enviados, motor.max_en_vuelo
+
+    r, segundos, operaciones, en_vuelo = asyncio.run(_motor())
+    return {
+        "pasos_modelo": pasos,
+        "operaciones": operaciones,
+        "segundos_async": segundos,
+        "segundos_secuencial": operaciones * latencia,
+        "aceleracion": operaciones * latencia / segundos if segundos else 0.0,
+        "max_en_vuelo": en_vuelo,
+        "mismo_resultado": r.resultado == modelo.io.resultado_final,
+    }
+
+
+def perfilar(expr: str, ruta: str, planificador=SimultaneousActivation) -> Instrumentacion:
+    inst = Instrumentacion()
+    modelo = CalculadoraAgentesModel(expr, planificador=planificador, seed=SEMILLA,
+                                     instrumentacion=inst)
+    while modelo.running:
+        modelo.step()
+    inst.exportar_chrome_trace(ruta)
+    return inst
+
+
+def ejecutar(tamanos=(4, 16, 64, 256), profundidades=(4, 16, 64), anchos=(3, 5, 7)) -> dict:
+    casos = []
+    for nombre_plan, plan in PLANIFICADORES.items():
+        for n in tamanos:
+            r = medir(expresion_larga(n), plan)
+            casos.append({"caso": "largo", "tamano": n, "planificador": nombre_plan,
+                          "modo_io": "secuencial", **r})
+        for d in profundidades:
+            r = medir(expresion_anidada(d), plan)
+            casos.append({"caso": "anidado", "tamano": d, "planificador": nombre_plan,
+                          "modo_io": "secuencial", **r})
+        # Árboles balanceados: acá se nota el modo DAG (ticks ~ profundidad)
+        for niveles in anchos:
+            for modo in ("secuencial", "dag"):
+                r = medir(expresion_ancha(niveles), plan, modo_io=modo)
+                casos.append({"caso": "ancho", "tamano": niveles, "planificador": nombre_plan,
+                              "modo_io": modo, **r})
+    return {"benchmark": "calculadora", "meta": metadatos(), "casos": casos}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de la calculadora por agentes")
+    ap.add_argument("--salida", default="bench_calculadora.json")
+    ap.add_argument("--rapido", action="store_true", help="solo tamaños pequeños")
+    ap.add_argument("--latencia", type=float, default=0.0,
+                    help="si es > 0, compara el motor asyncio con esta latencia por operación (s)")
+    ap.add_argument("--traza", default=None,
+                    help="guarda una traza de Chrome de un caso instrumentado en esta ruta")
+    args = ap.parse_args(argv)
+
+    if args.rapido:
+        datos = ejecutar(tamanos=(4, 16), profundidades=(4, 16), anchos=(3, 5))
+    else:
+        datos = ejecutar()
+    if args.latencia > 0:
+        datos["async"] = [
+            {"niveles": n, "latencia": args.latencia, **comparar_async(expresion_ancha(n), args.latencia)}
+            for n in ((2, 3, 4) if args.rapido else (2, 3, 4, 5, 6))
+        ]
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2)
+
+    for c in datos["casos"]:
+        print(f"{c['caso']:8} {c['tamano']:5} {c['planificador']:24} {c['modo_io']:10} "
+              f"{c['pasos']:6} pasos  {c['pasos_por_seg']:10.0f} pasos/s  "
+              f"{c['memoria_pico_bytes'] / 1024:8.1f} KiB")
+    for c in datos.get("async", []):
+        print(f"ancho    {c['niveles']:5} {c['operaciones']:4} ops  {c['pasos_modelo']:6} pasos  "
+              f"async {c['segundos_async']:.3f} s vs {c['segundos_secuencial']:.3f} s secuencial  "
+              f"(x{c['aceleracion']:.1f})")
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.traza:
+        perfilar(expresion_larga(64), args.traza).imprimir_resumen()
+        print(f"Traza guardada en {args.traza}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# benchmark_parser.py — parser de una pasada contra el original en dos pasadas.
+#
+# Uso:
+#   python benchmark_parser.py --salida bench_parser.json
+#
+# Compara Parser.compilar_rpn (findall + Shunting Yard juntos) con el parser
+# original en dos pasadas (tokens y después Shunting Yard, que se conserva
+# aquí solo como línea de base) sobre expresiones generadas de ~1k a ~100k
+# tokens (largas, anidadas y con variables), sin pasar por el cache. Los
+# casos de signo en que difieren están en tests/test_parser.py.
+import argparse
+import json
+import re
+import sys
+import time
+from typing import List
+
+from benchmark_calculadora import OPS, expresion_anidada
+from expresiones import IDENT_RE, NUM_RE, Parser, Token
+import rutas
+rutas.agregar_comun()
+from medicion import metadatos
+
+REPETICIONES = 5
+
+# ---------- Parser original (solo como línea de base) ----------
+# Dos pasadas: tokens y después Shunting Yard. Pega el signo a cualquier
+# literal ("3-2" se lee como 3 y -2, "-2^2" como (-2)^2) y no acepta el menos
+# delante de "(" o de una variable, así que solo sirve para medir.
+_TOK = re.compile(rf"\s*(?:({NUM_RE})|({IDENT_RE})|([+\-*/^()]))")
+
+
+def _tokens_original(expr: str) -> List[Token]:
+    out, i = [], 0
+    while i < len(expr):
+        m = _TOK.match(expr, i)
+        if not m:
+            raise ValueError(f"Token no reconocido cerca de: {expr[i:]}")
+        num, ident, sym = m.groups()
+        if num is not None:
+            out.append(Token(num, float(num)))
+        elif ident is not None:
+            out.append(Token(ident, es_variable=True))
+        else:
+            out.append(Token(sym))
+        i = m.end()
+    return out
+
+
+def _rpn_original(toks: List[Token]) -> List[Token]:
+    PRE, RIGHT = Parser.PRE, Parser.RIGHT
+    out, st = [], []
+    for tok in toks:
+        t = tok.texto
+        if tok.es_numero or tok.es_variable:
+            out.append(tok)
+        elif t in PRE:
+            while st and st[-1].texto in PRE:
+                top = st[-1].texto
+                if ((top not in RIGHT and PRE[top] >= PRE[t]) or
+                        (top in RIGHT and PRE[top] > PRE[t])):
+                    out.append(st.pop())
+                else:
+                    break
+            st.append(tok)
+        elif t == '(':
+            st.append(tok)
+        elif t == ')':
+            while st and st[-1].texto != '(':
+                out.append(st.pop())
+            if not st:
+                raise ValueError("Paréntesis desbalanceados")
+            st.pop()
+        else:
+            raise ValueError(f"Token inesperado: {t}")
+    while st:
+        top = st.pop()
+        if top.texto in '()':
+            raise ValueError("Paréntesis desbalanceados")
+        out.append(top)
+    return out
+
+
+def rpn_original(expr: str) -> List[str]:
+    """RPN (como cadenas) del parser original, para comparar con compilar_rpn."""
+    return [t.texto for t in _rpn_original(_tokens_original(expr))]
+
+
+def expresion_con_variables(n: int) -> str:
+    """(x0 + 1.5) + x1 + x2 + (x3 - 4.5) ... con ~n tokens."""
+    partes = []
+    for i in range(n * 3 // 10):  # ~3.3 tokens por término
+        op = OPS[i % len(OPS)]
+        partes.append(f"(x{i % 50} {op} {i % 9 + 1}.5)" if i % 3 == 0 else f"x{i % 50}")
+    return " + ".join(partes)
+
+
+def expresion_larga_compacta(n: int) -> str:
+    """1+2-3*4/5 ... sin espacios, ~n tokens."""
+    return "1" + "".join(f"{OPS[i % len(OPS)]}{i % 9 + 1}" for i in range(n // 2))
+
+
+def _mejor_tiempo(f, expr) -> float:
+    mejor = float("inf")
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        f(expr)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def medir(expr: str) -> dict:
+    def original(e):
+        return _rpn_original(_tokens_original(e))
+    nuevo = Parser().compilar_rpn
+
+    tokens = len(_tokens_original(expr))
+    t_orig = _mejor_tiempo(original, expr)
+    t_nuevo = _mejor_tiempo(nuevo, expr)
+    return {
+        "tokens": tokens,
+        "original_s": t_orig,
+        "una_pasada_s": t_nuevo,
+        "tokens_por_seg_original": tokens / t_orig,
+        "tokens_por_seg_una_pasada": tokens / t_nuevo,
+        "aceleracion": t_orig / t_nuevo,
+        "mismo_rpn": original(expr) == nuevo(expr),
+    }
+
+
+def ejecutar(tamanos=(1_000, 10_000, 100_000)) -> dict:
+    casos = []
+    for n in tamanos:
+        # Con espacios, para que el parser original lea bien las restas
+        casos.append({"caso": "variables", "tamano": n, **medir(expresion_con_variables(n))})
+        casos.append({"caso": "anidado", "tamano": n, **medir(expresion_anidada(n // 4))})
+        # Sin espacios el original confunde "3-2": solo se mide el tiempo
+        casos.append({"caso": "compacto", "tamano": n, **medir(expresion_larga_compacta(n))})
+    return {"benchmark": "parser", "meta": metadatos(), "casos": casos}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark del parser de la calculadora")
+    ap.add_argument("--salida", default="bench_parser.json")
+    ap.add_argument("--rapido", action="store_true", help="solo hasta 10k tokens")
+    args = ap.parse_args(argv)
+
+    datos = ejecutar((1_000, 10_000) if args.rapido else (1_000, 10_000, 100_000))
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2)
+
+    for c in datos["casos"]:
+        print(f"{c['caso']:10} {c['tokens']:7} tokens  original {c['original_s'] * 1e3:8.2f} ms  "
+              f"una pasada {c['una_pasada_s'] * 1e3:8.2f} ms  (x{c['aceleracion']:.1f})"
+              f"{'' if c['mismo_rpn'] else '  [RPN distinta]'}")
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+from collections import deque
+from itertools import count
+from typing import Deque, Dict, Optional, Tuple
+
+from operaciones import Mensaje
+
+
+Clave = Tuple[str, str]  # (operacion, tipo)
+
+
+class Buzon:
+    """
+    Buzón de mensajes con una cola FIFO por receptor.
+
+    Dentro de cada receptor los mensajes se separan por (operacion, tipo), así
+    que recibir no recorre los mensajes de otros agentes. Cada mensaje lleva
+    un número de secuencia global para conservar el orden de llegada cuando
+    la consulta no fija operación o tipo.
+    """
+
+    def __init__(self):
+        self._colas: Dict[Optional[int], Dict[Clave, Deque[Tuple[int, Mensaje]]]] = {}
+        self._secuencia = count()
+        self._pendientes = 0
+        self.pico_pendientes = 0
+        self.ultimo_escaneo = 0  # colas revisadas por el último recibir()
+
+    def enviar(self, msg: Mensaje):
+        colas = self._colas.setdefault(msg.receptor, {})
+        clave = (msg.operacion, msg.tipo)
+        cola = colas.get(clave)
+        if cola is None:
+            cola = colas[clave] = deque()
+        cola.append((next(self._secuencia), msg))
+        self._pendientes += 1
+        if self._pendientes > self.pico_pendientes:
+            self.pico_pendientes = self._pendientes
+
+    def recibir(self, receptor_id: int, esperado: Optional[str] = None,
+                tipo: Optional[str] = None) -> Optional[Mensaje]:
+        colas = self._colas.get(receptor_id)
+        if not colas:
+            self.ultimo_escaneo = 0
+            return None
+
+        if esperado is not None and tipo is not None:
+            self.ultimo_escaneo = 1
+            clave = (esperado, tipo)
+            if clave not in colas:
+                return None
+        else:
+            # Entre las colas que coinciden, la del mensaje más antiguo
+            self.ultimo_escaneo = len(colas)
+            clave, menor = None, None
+            for (op, tp), cola in colas.items():
+                if (esperado is None or op == esperado) and (tipo is None or tp == tipo):
+                    sec = cola[0][0]
+                    if menor is None or sec < menor:
+                        clave, menor = (op, tp), sec
+            if clave is None:
+                return None
+
+        cola = colas[clave]
+        _, msg = cola.popleft()
+        if not cola:
+            del colas[clave]
+            if not colas:
+                del self._colas[receptor_id]
+        self._pendientes -= 1
+        return msg
+
+    # ---- estadísticas ----
+    def pendientes(self) -> int:
+        return self._pendientes
+
+    def profundidad(self, receptor_id: int) -> int:
+        colas = self._colas.get(receptor_id)
+        return sum(len(c) for c in colas.values()) if colas else 0
+
+    def profundidad_maxima(self) -> int:
+        """Mayor cantidad de mensajes pendientes para un mismo receptor."""
+        return max((self.profundidad(r) for r in self._colas), default=0)
+
+    def __len__(self):
+        return self._pendientes
@@ -0,0 +1,153 @@
+# cli.py — punto de entrada sin interfaz de la calculadora.
+#
+# Uso:
+#   python cli.py evaluar "2 + 3 * 4 - 5"
+#   python cli.py evaluar "x ^ 2 + 1" "(x - 1) / 2" --var x=3 --modo-io dag
+#   python cli.py evaluar "(1 * 2) + (3 / 4)" --motor async --latencia 0.01
+#   python cli.py benchmark --rapido
+#   python cli.py benchmark-parser --rapido
+#   python cli.py interfaz --delta --pasos-por-frame 5
+#   python cli.py tiempo-import --presupuesto 2.0
+#
+# Cada comando importa lo que usa recién al correr, así solo `interfaz` carga
+# los módulos de visualización propios. `import mesa` (Mesa 2.x) igual trae
+# mesa.visualization y tornado, así que `evaluar --motor directo|async`, que
+# no usa Mesa, es el único camino sin esa pila. `benchmark` y
+# `benchmark-parser` le pasan el resto de los argumentos al main() de
+# benchmark_calculadora.py y benchmark_parser.py.
+import argparse
+import importlib
+import os
+import sys
+
+import rutas
+rutas.agregar_comun()
+from tiempo_import import agregar_subcomando
+
+# Segundos que puede tardar `import modelo_calculadora` en un proceso nuevo
+# (arranque en frío de un worker). La mayor parte es Mesa.
+PRESUPUESTO_IMPORT_S = 2.0
+
+DELEGADOS = {"benchmark": "benchmark_calculadora", "benchmark-parser": "benchmark_parser"}
+
+# Módulos propios que solo deberían cargarse al pedir la interfaz
+MODULOS_INTERFAZ = ("interfaz", "visualizacion_delta")
+
+MOTORES = ("agentes", "directo", "async")
+
+
+def _variables(pares):
+    variables = {}
+    for par in pares:
+        nombre, sep, valor = par.partition("=")
+        if not sep:
+            raise SystemExit(f"Variable mal escrita (se espera nombre=valor): {par}")
+        variables[nombre.strip()] = float(valor)
+    return variables
+
+
+def _evaluar_agentes(args, variables):
+    from modelo_calculadora import CalculadoraAgentesModel
+
+    inst = None
+    if args.instrumentar:
+        from instrumentacion import Instrumentacion
+        inst = Instrumentacion()
+    modelo = CalculadoraAgentesModel(
+        args.expresiones[0], expresiones=args.expresiones, capacidad=args.capacidad,
+        variables=variables, seed=args.seed, instrumentacion=inst, modo_io=args.modo_io,
+        agentes_por_operacion=args.agentes_por_operacion, despacho=args.despacho
+    )
+    while modelo.running:
+        modelo.step()
+    for r in sorted(modelo.resultados, key=lambda r: r["indice"]):
+        yield r["expr"], r["resultado"], r["error"]
+    print(f"ticks: {modelo.schedule.steps}")
+    if inst is not None:
+        inst.imprimir_resumen()
+
+
+def _evaluar_directo(args, variables):
+    from evaluador import evaluar
+
+    for expr in args.expresiones:
+        r = evaluar(expr, variables)
+        yield expr, r.resultado, r.error
+
+
+def _evaluar_async(args, variables):
+    import asyncio
+    from motor_async import MotorAsync
+
+    async def correr():
+        async with MotorAsync(args.capacidad, args.latencia) as motor:
+            return await motor.evaluar_muchas(args.expresiones, variables)
+
+    for expr, r in zip(args.expresiones, asyncio.run(correr())):
+        yield expr, r.resultado, r.error
+
+
+def cmd_evaluar(args):
+    variables = _variables(args.var)
+    evaluar = {"agentes": _evaluar_agentes, "directo": _evaluar_directo, "async": _evaluar_async}
+    errores = 0
+    try:
+        for expr, resultado, error in evaluar[args.motor](args, variables):
+            errores += error is not None
+            print(f"{expr} = {resultado}" if error is None else f"{expr}: error: {error}")
+    except ZeroDivisionError as e:
+        print(f"error: {e}")
+        return 1
+    return 1 if errores else 0
+
+
+def cmd_interfaz(args):
+    from interfaz import lanzar
+
+    lanzar(args.delta, args.pasos_por_frame, args.fps_max)
+
+
+def crear_parser():
+    ap = argparse.ArgumentParser(description="Calculadora por agentes sin interfaz")
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("evaluar", help="evalúa una o más expresiones")
+    p.add_argument("expresiones", nargs="+")
+    p.add_argument("--var", action="append", default=[], metavar="NOMBRE=VALOR")
+    p.add_argument("--motor", choices=MOTORES, default="agentes",
+                   help="agentes (modelo por ticks), directo (pila RPN) o async (motor_async)")
+    p.add_argument("--modo-io", choices=("secuencial", "dag"), default="secuencial")
+    p.add_argument("--capacidad", type=int, default=1, help="mensajes por tick de cada operador")
+    p.add_argument("--agentes-por-operacion", type=int, default=1)
+    p.add_argument("--despacho", choices=("round_robin", "menor_cola", "aleatorio"),
+                   default="round_robin")
+    p.add_argument("--latencia", type=float, default=0.0, help="segundos por operación (async)")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--instrumentar", action="store_true", help="imprime tiempos por fase (agentes)")
+    p.set_defaults(funcion=cmd_evaluar)
+
+    for nombre, modulo in DELEGADOS.items():
+        sub.add_parser(nombre, help=f"argumentos de {modulo}.py (ver `{nombre} -h`)", add_help=False)
+
+    p = sub.add_parser("interfaz", help="abre la interfaz de Mesa en el puerto 8521")
+    p.add_argument("--delta", action="store_true", help="usa ServidorDelta")
+    p.add_argument("--pasos-por-frame", type=int, default=1)
+    p.add_argument("--fps-max", type=float, default=None)
+    p.set_defaults(funcion=cmd_interfaz)
+
+    agregar_subcomando(sub, ["modelo_calculadora", "evaluador", "motor_async"], MODULOS_INTERFAZ,
+                       PRESUPUESTO_IMPORT_S, os.path.dirname(os.path.abspath(__file__)),
+                       sin_mesa=("evaluador", "motor_async", "expresiones", "operaciones"))
+    return ap
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in DELEGADOS:
+        return importlib.import_module(DELEGADOS[argv[0]]).main(argv[1:])
+    args = crear_parser().parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
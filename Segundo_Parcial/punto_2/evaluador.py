@@ -0,0 +1,114 @@
+# evaluador.py — evaluación directa de expresiones, sin ticks de Mesa.
+# Usa el mismo Parser (y su cache) y las mismas funciones de los agentes de
+# operación, así que resultados y errores coinciden con CalculadoraAgentesModel.
+# Solo depende de expresiones.py y operaciones.py: no carga Mesa.
+from typing import Dict, NamedTuple, Optional, Union
+
+import numpy as np
+
+from expresiones import OPERACIONES, Parser, Programa, Tabla, columnas_de_tabla
+from operaciones import FUNCIONES
+
+# Símbolo -> función, para no pasar por el nombre del agente en cada token
+_POR_SIMBOLO = {sim: FUNCIONES[nombre] for sim, nombre in OPERACIONES.items()}
+
+
+class ResultadoEvaluacion(NamedTuple):
+    """Equivalente a (io.resultado_final, io.error) al terminar el modelo."""
+    resultado: Optional[float]
+    error: Optional[str]
+
+
+def _compilar(expr_o_programa: Union[str, Programa], parser: Optional[Parser] = None) -> Programa:
+    if isinstance(expr_o_programa, Programa):
+        return expr_o_programa
+    return (parser or Parser()).compilar(expr_o_programa)
+
+
+def evaluar(expr: Union[str, Programa], variables: Optional[Dict[str, float]] = None,
+            parser: Optional[Parser] = None) -> ResultadoEvaluacion:
+    """
+    Evalúa la expresión con una pila RPN directa.
+
+    Igual que en el modelo por agentes, una división por cero lanza
+    ZeroDivisionError; los demás errores se devuelven en `error`.
+    """
+    try:
+        programa = _compilar(expr, parser)
+    except ValueError as e:
+        return ResultadoEvaluacion(None, str(e))
+
+    variables = variables or {}
+    stack = []
+    for tok in programa.rpn:
+        if tok.es_numero:
+            stack.append(tok.valor)
+            continue
+        if tok.es_variable:
+            if tok.texto not in variables:
+                return ResultadoEvaluacion(None, f"Variable no definida: {tok.texto}")
+            stack.append(float(variables[tok.texto]))
+            continue
+        if len(stack) < 2:
+            return ResultadoEvaluacion(None, "Faltan operandos")
+        b = stack.pop()
+        a = stack.pop()
+        if tok.texto == '/' and b == 0:
+            raise ZeroDivisionError("División por cero")
+        stack.append(_POR_SIMBOLO[tok.texto](a, b))
+
+    if len(stack) == 1:
+        return ResultadoEvaluacion(stack[-1], None)
+    return ResultadoEvaluacion(None, "Expresión inválida")
+
+
+def evaluar_vectorizado(expr: Union[str, Programa],
+                        variables: Optional[Dict[str, np.ndarray]] = None,
+                        parser: Optional[Parser] = None) -> np.ndarray:
+    """
+    Evalúa un programa compilado una sola vez sobre arreglos de NumPy.
+
+    `variables` asocia nombres a columnas; los literales se difunden
+    (broadcast) al largo de las columnas. Los errores de estructura
+    ("Faltan operandos", "Expresión inválida", errores del parser) se lanzan
+    como ValueError porque son los mismos para todas las filas; si algún
+    divisor es cero se lanza ZeroDivisionError como en el modelo.
+    Nota: a diferencia de Python, NumPy da nan (no un complejo) para una
+    base negativa con exponente fraccionario.
+    """
+    programa = _compilar(expr, parser)
+    variables = {k: np.asarray(v, dtype=float) for k, v in (variables or {}).items()}
+    forma = np.broadcast_shapes(*(v.shape for v in variables.values())) if variables else ()
+
+    stack = []
+    for tok in programa.rpn:
+        if tok.es_numero:
+            stack.append(tok.valor)
+            continue
+        if tok.es_variable:
+            if tok.texto not in variables:
+                raise ValueError(f"Variable no definida: {tok.texto}")
+            stack.append(variables[tok.texto])
+            continue
+        if len(stack) < 2:
+            raise ValueError("Faltan operandos")
+        b = stack.pop()
+        a = stack.pop()
+        if tok.texto == '/' and np.any(np.asarray(b) == 0):
+            raise ZeroDivisionError("División por cero")
+        stack.append(_POR_SIMBOLO[tok.texto](np.asarray(a, dtype=float), b))
+
+    if len(stack) != 1:
+        raise ValueError("Expresión inválida")
+    return np.broadcast_to(np.asarray(stack[-1], dtype=float), forma).copy()
+
+
+def evaluar_tabla(expr: Union[str, Programa], tabla: Tabla,
+                  parser: Optional[Parser] = None) -> np.ndarray:
+    """
+    Compila `expr` una vez y la evalúa para todas las filas de `tabla`
+    (lista de dicts o dict de columnas). Devuelve la columna de resultados.
+    """
+    programa = _compilar(expr, parser)
+    columnas = columnas_de_tabla(tabla)
+    return evaluar_vectorizado(programa, {n: columnas[n] for n in programa.variables if n in columnas})
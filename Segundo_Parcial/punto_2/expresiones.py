@@ -0,0 +1,286 @@
+# expresiones.py — parser de la calculadora (RPN, DAG y tablas de variables).
+#
+# Todo lo que no depende de Mesa: lo usan el modelo por agentes, el
+# evaluador directo y el motor asyncio. Importar este módulo no carga Mesa.
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+# ---------- Parser (tokens -> RPN con Shunting Yard) ----------
+NUM_RE = r"-?\d+(?:\.\d+)?"
+IDENT_RE = r"[A-Za-z_]\w*"
+OPERACIONES = {'+':'suma','-':'resta','*':'multiplicacion','/':'division','^':'potencia'}
+
+
+class Token(NamedTuple):
+    """Token ya clasificado: los números llevan su valor convertido."""
+    texto: str
+    valor: Optional[float] = None
+    es_variable: bool = False
+
+    @property
+    def es_numero(self) -> bool:
+        return self.valor is not None
+
+
+class Programa(NamedTuple):
+    """Expresión compilada a RPN con tokens tipados."""
+    clave: str
+    rpn: Tuple[Token, ...]
+    variables: Tuple[str, ...] = ()
+
+    @property
+    def textos(self) -> List[str]:
+        return [t.texto for t in self.rpn]
+
+
+class CacheProgramas:
+    """Cache LRU acotada de programas compilados, con contadores de aciertos/fallos."""
+    def __init__(self, maximo: int = 512):
+        self.maximo = maximo
+        self._datos: "OrderedDict[str, Programa]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: str) -> Optional[Programa]:
+        prog = self._datos.get(clave)
+        if prog is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return prog
+
+    def guardar(self, prog: Programa):
+        self._datos[prog.clave] = prog
+        self._datos.move_to_end(prog.clave)
+        if len(self._datos) > self.maximo:
+            self._datos.popitem(last=False)
+
+    def limpiar(self):
+        self._datos.clear()
+        self.aciertos = self.fallos = 0
+
+    def estadisticas(self) -> Dict[str, float]:
+        total = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tamano": len(self._datos),
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class ErrorSintaxis(ValueError):
+    """Error del parser con la posición (índice en la cadena) donde ocurrió."""
+    def __init__(self, mensaje: str, posicion: int):
+        super().__init__(f"{mensaje} (posición {posicion})")
+        self.posicion = posicion
+
+
+_TOKENS_OP = {s: Token(s) for s in "+-*/^"}
+_MENOS_UNO = Token("-1", -1.0)
+
+
+class Parser:
+    PRE = {'+':1,'-':1,'*':2,'/':2,'^':3}
+    RIGHT = {'^'}
+    # Una sola pasada: número (con signo opcional), identificador, operador o
+    # paréntesis, o cualquier otro carácter visible (error). Los espacios
+    # quedan entre coincidencias y no generan tokens.
+    ESCANER = re.compile(rf"({NUM_RE})|({IDENT_RE})|([+\-*/^()])|(\S)")
+    # Menos unario delante de '(', de una variable o de un número seguido de
+    # '^': -1 * (...) con una precedencia entre * / y ^, así -x^2 = -(x^2),
+    # -2^2 = -(2^2) y -x*y = (-x)*y
+    PRE_NEGACION = 2.5
+    # Compartida por todos los parsers: las mismas plantillas se repiten entre modelos
+    cache = CacheProgramas()
+
+    @staticmethod
+    def normalizar(expr: str) -> str:
+        return " ".join(expr.split())
+
+    def compilar(self, expr: str) -> Programa:
+        """Tokeniza y pasa a RPN una sola vez por expresión (normalizada)."""
+        clave = self.normalizar(expr)
+        prog = self.cache.obtener(clave)
+        if prog is None:
+            rpn = self.compilar_rpn(expr)
+            nombres = tuple(dict.fromkeys(t.texto for t in rpn if t.es_variable))
+            prog = Programa(clave, tuple(rpn), nombres)
+            self.cache.guardar(prog)
+        return prog
+
+    def compilar_rpn(self, expr: str) -> List[Token]:
+        """
+        Tokenizador y Shunting Yard en una sola pasada: un findall sobre la
+        cadena y un recorrido que va dejando la RPN tipada. Lleva la cuenta de
+        si se espera un operando o un operador, lo que permite:
+
+        - distinguir la resta del signo: "3-2" y "x-2" son restas, "3*-2" y
+          "-2" son literales negativos;
+        - menos unario delante de "(", de una variable o de un número seguido
+          de "^" (-1 *, ver PRE_NEGACION): "-2^2", "-x^2" y "-(2)^2" son todos
+          -(...^2), como en la notación matemática;
+        - informar la posición exacta de cada error (ErrorSintaxis).
+
+        Los tokens repetidos (mismo número o variable) se reutilizan, y la
+        posición solo se calcula cuando hay un error.
+        """
+        out: List[Token] = []
+        ops: List[Tuple[Optional[Token], float, int]] = []  # (token, precedencia, nº de token); '(' = None
+        agregar = out.append
+        PRE = self.PRE
+        numeros: Dict[str, Token] = {}
+        nombres: Dict[str, Token] = {}
+        espera_operando = True
+
+        def error(mensaje: str, indice: int):
+            raise ErrorSintaxis(mensaje, self._posicion(expr, indice))
+
+        piezas = self.ESCANER.findall(expr)
+        for i, (num, ident, sim, otro) in enumerate(piezas):
+            if num:
+                if espera_operando and num[0] == '-' and i + 1 < len(piezas) and piezas[i + 1][2] == '^':
+                    # "-2^2": el signo no se pega al literal, niega la potencia entera
+                    agregar(_MENOS_UNO)
+                    ops.append((_TOKENS_OP['*'], self.PRE_NEGACION, i))
+                    num = num[1:]
+                elif not espera_operando:
+                    if num[0] != '-':
+                        error(f"Expresión inválida: falta un operador antes de '{num}'", i)
+                    # "3-2": el signo es la resta
+                    while ops and ops[-1][1] >= 1:
+                        agregar(ops.pop()[0])
+                    ops.append((_TOKENS_OP['-'], 1, i))
+                    num = num[1:]
+                tok = numeros.get(num)
+                if tok is None:
+                    tok = numeros[num] = Token(num, float(num))
+                agregar(tok)
+                espera_operando = False
+            elif ident:
+                if not espera_operando:
+                    error(f"Expresión inválida: falta un operador antes de '{ident}'", i)
+                tok = nombres.get(ident)
+                if tok is None:
+                    tok = nombres[ident] = Token(ident, es_variable=True)
+                agregar(tok)
+                espera_operando = False
+            elif sim == '(':
+                if not espera_operando:
+                    error("Expresión inválida: falta un operador antes de '('", i)
+                ops.append((None, 0, i))
+            elif sim == ')':
+                if espera_operando:
+                    error("Faltan operandos antes de ')'", i)
+                while ops and ops[-1][0] is not None:
+                    agregar(ops.pop()[0])
+                if not ops:
+                    error("Paréntesis desbalanceados: ')' sin abrir", i)
+                ops.pop()
+            elif sim:
+                if espera_operando:
+                    if sim != '-':
+                        error(f"Faltan operandos antes de '{sim}'", i)
+                    agregar(_MENOS_UNO)
+                    ops.append((_TOKENS_OP['*'], self.PRE_NEGACION, i))
+                    continue
+                p = PRE[sim]
+                derecha = sim in self.RIGHT
+                while ops:
+                    p_top = ops[-1][1]
+                    if p_top > p or (p_top == p and not derecha):
+                        agregar(ops.pop()[0])
+                    else:
+                        break
+                ops.append((_TOKENS_OP[sim], p, i))
+                espera_operando = True
+            else:
+                error(f"Token no reconocido: '{otro}'", i)
+
+        if espera_operando:
+            if not out:
+                raise ErrorSintaxis("Expresión vacía", len(expr))
+            raise ErrorSintaxis("Faltan operandos al final", len(expr))
+        while ops:
+            tok, _, i = ops.pop()
+            if tok is None:
+                error("Paréntesis desbalanceados: '(' sin cerrar", i)
+            agregar(tok)
+        return out
+
+    def _posicion(self, expr: str, indice: int) -> int:
+        """Posición en la cadena del token número `indice` (solo para errores)."""
+        for i, m in enumerate(self.ESCANER.finditer(expr)):
+            if i == indice:
+                return m.start()
+        return len(expr)
+
+
+# ---------- DAG de la expresión ----------
+class Dag(NamedTuple):
+    """
+    RPN como grafo de dependencias, en orden topológico. Cada nodo es un
+    token (número, variable u operador); `hijos[n]` son los índices de los
+    operandos de un operador ((-1, -1) en las hojas). Las subexpresiones
+    repetidas comparten un mismo nodo.
+    """
+    nodos: Tuple[Token, ...]
+    hijos: Tuple[Tuple[int, int], ...]
+    raiz: int
+
+
+def compilar_dag(programa: Programa) -> Dag:
+    """Arma el DAG con eliminación de subexpresiones comunes (por estructura)."""
+    nodos: List[Token] = []
+    hijos: List[Tuple[int, int]] = []
+    vistos: Dict[tuple, int] = {}
+    pila: List[int] = []
+    for tok in programa.rpn:
+        if tok.es_numero or tok.es_variable:
+            clave = ("v" if tok.es_variable else "n", tok.texto)
+            par = (-1, -1)
+        else:
+            if len(pila) < 2:
+                raise ValueError("Faltan operandos")
+            der = pila.pop()
+            izq = pila.pop()
+            clave = (tok.texto, izq, der)
+            par = (izq, der)
+        n = vistos.get(clave)
+        if n is None:
+            n = vistos[clave] = len(nodos)
+            nodos.append(tok)
+            hijos.append(par)
+        pila.append(n)
+    if len(pila) != 1:
+        raise ValueError("Expresión inválida")
+    return Dag(tuple(nodos), tuple(hijos), pila[0])
+
+
+# ---------- Tablas de variables ----------
+Tabla = Union[Sequence[Mapping[str, Any]], Mapping[str, Sequence[Any]]]
+
+
+def filas_de_tabla(tabla: Tabla) -> List[Dict[str, Any]]:
+    """Acepta una lista de dicts o un dict de columnas y devuelve filas."""
+    if isinstance(tabla, Mapping):
+        nombres = list(tabla)
+        return [dict(zip(nombres, valores)) for valores in zip(*(tabla[n] for n in nombres))]
+    return [dict(fila) for fila in tabla]
+
+
+def columnas_de_tabla(tabla: Tabla) -> Dict[str, List[Any]]:
+    """Acepta una lista de dicts o un dict de columnas y devuelve columnas."""
+    if isinstance(tabla, Mapping):
+        return dict(tabla)
+    columnas: Dict[str, List[Any]] = {}
+    for fila in tabla:
+        for nombre, valor in fila.items():
+            columnas.setdefault(nombre, []).append(valor)
+    return columnas
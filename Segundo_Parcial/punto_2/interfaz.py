@@ -7,14 +7,26 @@ from mesa.visualization.ModularVisualization import ModularServer
 from mesa.visualization.modules import CanvasGrid, TextElement
 
 from modelo_calculadora import CalculadoraAgentesModel, portrayal
+import rutas
+rutas.agregar_comun()
+from visualizacion_delta import ElementoDelta, ServidorDelta
 
 
 class EstadoTexto(TextElement):
+    def __init__(self):
+        super().__init__()
+        self._rpn = (None, "")  # la RPN no cambia entre ticks: se une una vez
+
+    def _texto_rpn(self, rpn):
+        if self._rpn[0] is not rpn:
+            self._rpn = (rpn, " ".join(rpn) if rpn else "(pendiente)")
+        return self._rpn[1]
+
     def render(self, model):
         io = model.io
         lines = [
             f"<b>Expr:</b> {io.expr}",
-            f"<b>RPN:</b> {' '.join(io.rpn) if io.rpn else '(pendiente)'}",
+            f"<b>RPN:</b> {self._texto_rpn(io.rpn)}",
             f"<b>Stack:</b> {io.stack}",
             f"<b>Último:</b> {io.ultimo_mensaje or '(—)'}",
         ]
@@ -25,19 +37,30 @@ class EstadoTexto(TextElement):
         return "<br>".join(lines)
 
 
-def lanzar():
+def lanzar(delta=False, pasos_por_frame=1, fps_max=None):
+    """
+    Con delta=True usa ServidorDelta: la grilla y el texto mandan solo lo
+    que cambió, y cada frame corre `pasos_por_frame` ticks (o más, hasta
+    respetar `fps_max`).
+    """
     grid = CanvasGrid(portrayal, 7, 3, 700, 300)
 
     # Modelo sin parámetros de UI: usa la constante DEFAULT_EXPR
     def make_model():
         return CalculadoraAgentesModel(expresion=DEFAULT_EXPR)
 
-    server = ModularServer(
-        make_model,
-        [grid, EstadoTexto()],
-        "Calculadora por Agentes (mínima y estable)",
-        {}
-    )
+    titulo = "Calculadora por Agentes (mínima y estable)"
+    if delta:
+        server = ServidorDelta(
+            make_model,
+            [ElementoDelta(grid, por_portrayal=True), ElementoDelta(EstadoTexto())],
+            titulo,
+            {},
+            pasos_por_frame=pasos_por_frame,
+            fps_max=fps_max
+        )
+    else:
+        server = ModularServer(make_model, [grid, EstadoTexto()], titulo, {})
     server.port = 8521
     server.launch()
 
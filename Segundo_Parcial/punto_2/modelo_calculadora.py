@@ -1,70 +1,61 @@
-import re
-from typing import List, Dict, Optional
+import time
+from collections import deque
+from typing import Any, Iterable, List, Dict, Optional, Tuple, Union
+
+import numpy as np
 from mesa import Model, Agent
 from mesa.time import SimultaneousActivation
 from mesa.space import MultiGrid
 from mesa.datacollection import DataCollector
 
 from agentes_operaciones import (
-    Mensaje,
     AgenteSuma, AgenteResta, AgenteMultiplicacion, AgenteDivision, AgentePotencia
 )
-
-# ---------- Parser (tokens -> RPN con Shunting Yard) ----------
-NUM_RE = r"-?\d+(?:\.\d+)?"
-
-class Parser:
-    PRE = {'+':1,'-':1,'*':2,'/':2,'^':3}
-    RIGHT = {'^'}
-    TOK = re.compile(rf"\s*(?:({NUM_RE})|([+\-*/^()]))")
-
-    def tokens(self, expr: str) -> List[str]:
-        out, i = [], 0
-        while i < len(expr):
-            m = self.TOK.match(expr, i)
-            if not m: raise ValueError(f"Token no reconocido cerca de: {expr[i:]}")
-            num, sym = m.groups()
-            out.append(num if num is not None else sym)
-            i = m.end()
-        return out
-
-    def a_rpn(self, toks: List[str]) -> List[str]:
-        out, st = [], []
-        for t in toks:
-            if re.fullmatch(NUM_RE, t):
-                out.append(t)
-            elif t in self.PRE:
-                while st and st[-1] in self.PRE:
-                    top = st[-1]
-                    if ((top not in self.RIGHT and self.PRE[top] >= self.PRE[t]) or
-                        (top in self.RIGHT and self.PRE[top] > self.PRE[t])):
-                        out.append(st.pop())
-                    else:
-                        break
-                st.append(t)
-            elif t == '(':
-                st.append(t)
-            elif t == ')':
-                while st and st[-1] != '(':
-                    out.append(st.pop())
-                if not st: raise ValueError("Paréntesis desbalanceados")
-                st.pop()
-            else:
-                raise ValueError(f"Token inesperado: {t}")
-        while st:
-            top = st.pop()
-            if top in '()': raise ValueError("Paréntesis desbalanceados")
-            out.append(top)
-        return out
-
+from operaciones import Mensaje, MensajeLote, describir_errores
+from buzon import Buzon
+from expresiones import (
+    OPERACIONES, Dag, Parser, Programa, Tabla, columnas_de_tabla, compilar_dag, filas_de_tabla
+)
+import rutas
+rutas.agregar_comun()
+from colector import ColectorAnillo
+from instrumentacion import Instrumentacion, fase, instrumentado
 
 # ---------- Agente IO ----------
 class AgenteIO(Agent):
-    """Convierte la expresión a RPN y la evalúa paso a paso."""
-    def __init__(self, unique_id, model, expr: str):
+    """
+    Convierte la expresión a RPN y la evalúa paso a paso.
+
+    Con modo="secuencial" (el original) recorre la RPN y espera la respuesta
+    de cada operación antes de seguir: un solo agente de operación trabaja a
+    la vez. Con modo="dag" compila la RPN a un DAG (ver compilar_dag) y en
+    cada tick pide todas las operaciones cuyos operandos ya están listos;
+    las respuestas se asocian por `correlacion`. Los ticks pasan de O(n) a
+    O(profundidad) en expresiones balanceadas.
+
+    Con modo="lote" recorre la RPN como el secuencial, pero las variables
+    son columnas (arreglos) y cada operación viaja en un MensajeLote: una
+    sola ida y vuelta por operador sirve a todas las filas. Los errores son
+    por fila (ver `errores_lote`) en lugar de cortar la evaluación.
+    """
+    MODOS = ("secuencial", "dag", "lote")
+
+    def __init__(self, unique_id, model, expr: str, variables: Optional[Dict[str, float]] = None,
+                 modo: str = "secuencial"):
         super().__init__(unique_id, model)
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de IO desconocido: {modo}")
+        self.modo = modo
         self.parser = Parser()
+        self.reiniciar_expr(expr, variables)
+
+    def reiniciar_expr(self, expr: str, variables: Optional[Dict[str, float]] = None,
+                       indice: Optional[int] = None):
+        # No se vuelve a llamar a __init__ para no perder la posición en el grid
         self.expr = expr
+        self.variables: Dict[str, float] = variables or {}
+        self.indice = indice
+        self.programa: Optional[Programa] = None
         self.rpn: List[str] = []
         self.i = 0
         self.stack: List[float] = []
@@ -73,47 +64,89 @@ class AgenteIO(Agent):
         self.ultimo_mensaje: str = ""
         self.resultado_final: Optional[float] = None
         self.error: Optional[str] = None
-
-    def reiniciar_expr(self, expr: str):
-        self.__init__(self.unique_id, self.model, expr)
+        self.registrado = False  # el modelo ya guardó su resultado
+        # Modo DAG
+        self.dag: Optional[Dag] = None
+        self.valores: List[Optional[float]] = []
+        self.en_vuelo: Dict[int, str] = {}  # correlacion (nodo) -> operación pedida
+        # Modo lote: banderas de error por fila (ver operaciones.ERROR_*)
+        self.errores_lote: Optional[np.ndarray] = None
+        self.tick_inicio = self.model.schedule.steps if self.model.schedule else 0
+
+    @property
+    def terminado(self) -> bool:
+        return self.error is not None or self.resultado_final is not None
 
     def _op_to_agent_name(self, t: str) -> str:
-        return {'+':'suma','-':'resta','*':'multiplicacion','/':'division','^':'potencia'}[t]
+        return OPERACIONES[t]
 
+    @staticmethod
+    def _texto(valor) -> str:
+        # En modo lote los valores son columnas: no se vuelcan enteras al texto
+        if isinstance(valor, np.ndarray) and valor.ndim:
+            return f"[{valor.size} valores]"
+        return str(valor)
+
+    @instrumentado
     def step(self):
         if self.error or self.resultado_final is not None:
             return
 
         try:
-            if not self.rpn:
-                toks = self.parser.tokens(self.expr)
-                self.rpn = self.parser.a_rpn(toks)
+            if self.programa is None:
+                with fase(self.model.instrumentacion, "parse"):
+                    self.programa = self.parser.compilar(self.expr)
+                self.rpn = self.programa.textos
                 self.i = 0
                 self.ultimo_mensaje = f"RPN: {' '.join(self.rpn)}"
+                if self.modo == "dag":
+                    self._preparar_dag()
+
+            if self.modo == "dag":
+                if self.error is None:
+                    self._step_dag()
+                return
 
             if self.esperando:
                 resp = self.model.recibir_mensaje(self.unique_id, esperado=self.operador_en_curso, tipo='response')
                 if resp:
                     self.stack.append(resp.resultado)
+                    if isinstance(resp, MensajeLote):
+                        self.errores_lote = (resp.errores if self.errores_lote is None
+                                             else self.errores_lote | resp.errores)
                     self.esperando = False
                     self.operador_en_curso = None
-                    self.ultimo_mensaje = f"Respuesta {resp.operacion}: {resp.resultado}"
+                    self.ultimo_mensaje = f"Respuesta {resp.operacion}: {self._texto(resp.resultado)}"
                 return
 
             if self.i >= len(self.rpn):
                 if len(self.stack) == 1:
                     self.resultado_final = self.stack[-1]
-                    self.ultimo_mensaje = f"Resultado = {self.resultado_final}"
+                    if self.modo == "lote":
+                        self._cerrar_lote()
+                    self.ultimo_mensaje = f"Resultado = {self._texto(self.resultado_final)}"
                 else:
                     self.error = "Expresión inválida"
                 return
 
-            t = self.rpn[self.i]
+            tok = self.programa.rpn[self.i]
             self.i += 1
 
-            if re.fullmatch(NUM_RE, t):
-                self.stack.append(float(t))
-                self.ultimo_mensaje = f"Apilar número {t}"
+            if tok.es_numero:
+                self.stack.append(tok.valor)
+                self.ultimo_mensaje = f"Apilar número {tok.texto}"
+                return
+
+            if tok.es_variable:
+                if tok.texto not in self.variables:
+                    self.error = f"Variable no definida: {tok.texto}"
+                    return
+                if self.modo == "lote":
+                    valor = np.asarray(self.variables[tok.texto], dtype=float)
+                else:
+                    valor = float(self.variables[tok.texto])
+                self.stack.append(valor)
+                self.ultimo_mensaje = f"Apilar {tok.texto} = {self._texto(valor)}"
                 return
 
             if len(self.stack) < 2:
@@ -122,9 +155,9 @@ class AgenteIO(Agent):
 
             b = self.stack.pop()
             a = self.stack.pop()
-            agente_op = self._op_to_agent_name(t)
+            agente_op = self._op_to_agent_name(tok.texto)
 
-            req = Mensaje(
+            req = (MensajeLote if self.modo == "lote" else Mensaje)(
                 tipo="request",
                 operacion=agente_op,
                 operandos=(a, b),
@@ -134,61 +167,402 @@ class AgenteIO(Agent):
             self.model.enviar_mensaje(req)
             self.esperando = True
             self.operador_en_curso = agente_op
-            self.ultimo_mensaje = f"Solicitar {agente_op}({a}, {b})"
+            self.ultimo_mensaje = f"Solicitar {agente_op}({self._texto(a)}, {self._texto(b)})"
 
         except Exception as e:
             self.error = str(e)
 
+    # ---- modo lote ----
+    def _cerrar_lote(self):
+        """Deja resultado y banderas como arreglos del mismo largo (nan donde hubo error)."""
+        # Largo de las columnas de entrada: una expresión constante ("2 + 3")
+        # también tiene que dar una fila por fila de la tabla
+        columnas = [np.shape(v) for v in self.variables.values()]
+        forma = np.broadcast_shapes(*columnas) if columnas else ()
+        errores = self.errores_lote if self.errores_lote is not None else np.uint8(0)
+        self.resultado_final = np.broadcast_to(
+            np.asarray(self.resultado_final, dtype=float), forma).copy()
+        self.errores_lote = np.broadcast_to(errores, forma).astype(np.uint8)
+
+    def errores_por_fila(self) -> List[Optional[str]]:
+        """Descripción del error de cada fila del lote (None donde salió bien)."""
+        if self.errores_lote is None:
+            return []
+        return [describir_errores(int(b)) for b in np.ravel(self.errores_lote)]
+
+    # ---- modo DAG ----
+    def _preparar_dag(self):
+        dag = compilar_dag(self.programa)
+        self.dag = dag
+        self.valores = [None] * len(dag.nodos)
+        self._faltan = [0] * len(dag.nodos)        # operandos sin valor de cada nodo
+        self._padres: List[List[int]] = [[] for _ in dag.nodos]
+        self._listos: deque = deque()
+        for n, tok in enumerate(dag.nodos):
+            if tok.es_numero:
+                self.valores[n] = tok.valor
+            elif tok.es_variable:
+                if tok.texto not in self.variables:
+                    self.error = f"Variable no definida: {tok.texto}"
+                    return
+                self.valores[n] = float(self.variables[tok.texto])
+            else:
+                # Orden topológico: las hojas ya tienen valor, los operadores no
+                pendientes = {h for h in dag.hijos[n] if self.valores[h] is None}
+                for h in pendientes:
+                    self._padres[h].append(n)
+                self._faltan[n] = len(pendientes)
+                if not pendientes:
+                    self._listos.append(n)
+
+    def _step_dag(self):
+        # Juntar todas las respuestas que llegaron
+        while self.en_vuelo:
+            resp = self.model.recibir_mensaje(self.unique_id, tipo='response')
+            if resp is None:
+                break
+            n = resp.correlacion
+            del self.en_vuelo[n]
+            self.valores[n] = resp.resultado
+            for p in self._padres[n]:
+                self._faltan[p] -= 1
+                if self._faltan[p] == 0:
+                    self._listos.append(p)
+
+        raiz = self.valores[self.dag.raiz]
+        if raiz is not None:
+            self.stack = [raiz]
+            self.esperando = False
+            self.resultado_final = raiz
+            self.ultimo_mensaje = f"Resultado = {raiz}"
+            return
+
+        # Pedir todo lo que ya tiene sus dos operandos
+        while self._listos:
+            n = self._listos.popleft()
+            izq, der = self.dag.hijos[n]
+            agente_op = self._op_to_agent_name(self.dag.nodos[n].texto)
+            req = Mensaje(
+                tipo="request",
+                operacion=agente_op,
+                operandos=(self.valores[izq], self.valores[der]),
+                emisor=self.unique_id,
+                receptor=self.model.obtener_id_agente(agente_op),
+                correlacion=n
+            )
+            self.model.enviar_mensaje(req)
+            self.en_vuelo[n] = agente_op
+        self.esperando = bool(self.en_vuelo)
+        self.ultimo_mensaje = f"En vuelo: {len(self.en_vuelo)} operaciones"
+
 
 # ---------- Modelo Mesa ----------
 class CalculadoraAgentesModel(Model):
-    def __init__(self, expresion: str = "2 + 3 * 4 - 5"):
+    """
+    Modelo de la calculadora.
+
+    Con `expresion` evalúa una sola expresión (modo original), con las
+    `variables` dadas. Con `expresiones` (lista o iterable) evalúa muchas a la
+    vez: crea un AgenteIO por expresión, o un pool de `tam_pool` agentes IO
+    que toman la siguiente expresión pendiente al terminar. Con `tabla`
+    (lista de dicts o dict de columnas) evalúa `expresion` una vez por fila.
+    Todos comparten los mismos agentes de operación, que atienden hasta
+    `capacidad` mensajes por tick. `planificador` permite cambiar la clase
+    de activación de Mesa (por ejemplo para los benchmarks) y `seed` siembra
+    `self.random`, que usan los planificadores aleatorios de Mesa.
+
+    Con `capacidad_historial` o `intervalo_muestreo` > 1 se usa ColectorAnillo
+    en vez del DataCollector de Mesa (memoria acotada, volcado opcional a
+    `directorio_volcado`). Con `instrumentacion` (ver instrumentacion.py) se
+    miden las fases de cada paso, el step de cada agente, el parseo y la
+    mensajería. `modo_io` elige cómo recorre la expresión cada AgenteIO
+    ("secuencial", "dag" o "lote", ver AgenteIO). Con modo_io="lote" y una
+    `tabla`, un solo IO evalúa `expresion` sobre las columnas enteras y
+    columna_resultados() devuelve una fila por fila de la tabla.
+
+    `agentes_por_operacion` (un número, o un dict por operación) arma un pool
+    de agentes por operación; `despacho` elige a cuál mandar cada petición:
+    "round_robin", "menor_cola" (el de menos mensajes pendientes) o
+    "aleatorio". `agentes_ops[op]` sigue apuntando al primero de cada pool.
+    """
+    DESPACHOS = ("round_robin", "menor_cola", "aleatorio")
+
+    def __init__(self, expresion: str = "2 + 3 * 4 - 5",
+                 expresiones: Optional[Iterable[str]] = None,
+                 capacidad: int = 1, tam_pool: Optional[int] = None,
+                 variables: Optional[Dict[str, float]] = None,
+                 tabla: Optional[Tabla] = None,
+                 planificador=SimultaneousActivation,
+                 capacidad_historial: Optional[int] = None, intervalo_muestreo: int = 1,
+                 directorio_volcado: Optional[str] = None, *, seed: Optional[int] = None,
+                 instrumentacion: Optional[Instrumentacion] = None,
+                 modo_io: str = "secuencial",
+                 agentes_por_operacion: Union[int, Dict[str, int]] = 1,
+                 despacho: str = "round_robin"):
+        if despacho not in self.DESPACHOS:
+            raise ValueError(f"Despacho desconocido: {despacho}")
         super().__init__()
+        self.modo_io = modo_io
+        self.despacho = despacho
         self.running = True
+        # None = sin medición; los agentes la consultan en cada step
+        self.instrumentacion = instrumentacion
         self.grid = MultiGrid(7, 3, torus=False)
-        self.schedule = SimultaneousActivation(self)
-        self._mensajes: List[Mensaje] = []
-
-        self.io = AgenteIO(1, self, expresion)
-        self.schedule.add(self.io)
-        self.grid.place_agent(self.io, (1, 1))
+        self.schedule = planificador(self)
+        self.buzon = Buzon()
+
+        if tabla is not None and modo_io == "lote":
+            columnas = {n: np.asarray(v, dtype=float) for n, v in columnas_de_tabla(tabla).items()}
+            fuente = iter([(expresion, columnas)])
+        elif tabla is not None:
+            fuente = ((expresion, fila) for fila in filas_de_tabla(tabla))
+        elif expresiones is not None:
+            fuente = ((e, variables) for e in expresiones)
+        else:
+            fuente = iter(())
+        self._fuente = fuente
+        self._cola_expr: deque = deque()
+        self._indice_siguiente = 0
+        self.tam_pool = tam_pool
+        self.ios: List[AgenteIO] = []
+        self.resultados: List[Dict] = []
+        self.peticiones_enviadas = 0  # requests a los agentes de operación
+        self._t_inicio = time.perf_counter()
+
+        multiple = expresiones is not None or tabla is not None
+        if not multiple:
+            self._cola_expr.append((expresion, variables))
+        primera = self._siguiente_expresion()
+        self.io = AgenteIO(1, self, "", modo=modo_io)
+        self._agregar_io(self.io)
+        if primera is not None:
+            self.io.reiniciar_expr(*primera)
+        else:
+            # Flujo vacío: el IO queda libre hasta que llegue una expresión
+            self.io.registrado = True
+            self.running = False
 
         self.agentes_ops: Dict[str, Agent] = {}
+        self.pools: Dict[str, List[Agent]] = {}
+        self._turno: Dict[str, int] = {}
         def add(op_cls, uid, pos, key):
-            ag = op_cls(uid, self)
+            ag = op_cls(uid, self, capacidad=capacidad)
             self.schedule.add(ag)
-            self.grid.place_agent(ag, pos)
-            self.agentes_ops[key] = ag
-
-        add(AgenteSuma, 2, (3, 2), 'suma')
-        add(AgenteResta, 3, (3, 0), 'resta')
-        add(AgenteMultiplicacion, 4, (4, 2), 'multiplicacion')
-        add(AgenteDivision, 5, (4, 0), 'division')
-        add(AgentePotencia, 6, (5, 1), 'potencia')
-
-        self.datacollector = DataCollector(
-            model_reporters={
-                "StackSize": lambda m: len(m.io.stack),
-                "Hecho": lambda m: 1 if m.io.resultado_final is not None else 0
+            self.grid.place_agent(ag, pos)  # los del mismo pool comparten celda
+            self.agentes_ops.setdefault(key, ag)
+            self.pools.setdefault(key, []).append(ag)
+            self._turno[key] = 0
+
+        ubicaciones = [
+            (AgenteSuma, 2, (3, 2), 'suma'),
+            (AgenteResta, 3, (3, 0), 'resta'),
+            (AgenteMultiplicacion, 4, (4, 2), 'multiplicacion'),
+            (AgenteDivision, 5, (4, 0), 'division'),
+            (AgentePotencia, 6, (5, 1), 'potencia'),
+        ]
+        for op_cls, uid, pos, key in ubicaciones:
+            add(op_cls, uid, pos, key)
+        # Los agentes extra de cada pool toman ids después de los originales
+        self._siguiente_uid = 7
+        for op_cls, _, pos, key in ubicaciones:
+            n = (agentes_por_operacion.get(key, 1) if isinstance(agentes_por_operacion, dict)
+                 else agentes_por_operacion)
+            for _ in range(n - 1):
+                add(op_cls, self._siguiente_uid, pos, key)
+                self._siguiente_uid += 1
+
+        if multiple:
+            self._lanzar_pendientes()
+
+        reporteros = {
+            "StackSize": lambda m: len(m.io.stack),
+            "Hecho": lambda m: 1 if m.io.resultado_final is not None else 0,
+            "MensajesPendientes": lambda m: m.buzon.pendientes(),
+            "ColaMaxima": lambda m: m.buzon.profundidad_maxima(),
+            "Completadas": lambda m: len(m.resultados),
+        }
+        if capacidad_historial is None and intervalo_muestreo == 1:
+            self.datacollector = DataCollector(model_reporters=reporteros)
+        else:
+            self.datacollector = ColectorAnillo(
+                reporteros, capacidad=capacidad_historial or 10000,
+                intervalo=intervalo_muestreo, directorio_volcado=directorio_volcado
+            )
+
+    # ---- varias expresiones ----
+    def _siguiente_expresion(self) -> Optional[Tuple[str, Optional[Dict[str, float]], int]]:
+        """Siguiente (expresión, variables, índice) pendiente, o None."""
+        if self._cola_expr:
+            expr, variables = self._cola_expr.popleft()
+        else:
+            siguiente = next(self._fuente, None)
+            if siguiente is None:
+                return None
+            expr, variables = siguiente
+        indice = self._indice_siguiente
+        self._indice_siguiente += 1
+        return expr, variables, indice
+
+    def _agregar_io(self, io: "AgenteIO"):
+        self.schedule.add(io)
+        self.grid.place_agent(io, (1, 1))
+        self.ios.append(io)
+
+    def _lanzar_pendientes(self):
+        """Asigna expresiones pendientes a IO libres y crea nuevos hasta llenar el pool."""
+        for io in self.ios:
+            if io.registrado:
+                siguiente = self._siguiente_expresion()
+                if siguiente is None:
+                    return
+                io.reiniciar_expr(*siguiente)
+        while self.tam_pool is None or len(self.ios) < self.tam_pool:
+            siguiente = self._siguiente_expresion()
+            if siguiente is None:
+                return
+            io = AgenteIO(self._siguiente_uid, self, "", modo=self.modo_io)
+            io.reiniciar_expr(*siguiente)
+            self._siguiente_uid += 1
+            self._agregar_io(io)
+
+    def agregar_expresion(self, expr: str, variables: Optional[Dict[str, float]] = None):
+        """Encola una expresión más (modo flujo)."""
+        self._cola_expr.append((expr, variables))
+        self._lanzar_pendientes()
+        self.running = True
+
+    def _recoger_terminados(self):
+        vivos = []
+        for io in self.ios:
+            if io.terminado and not io.registrado:
+                self.resultados.append({
+                    "indice": io.indice,
+                    "expr": io.expr,
+                    "variables": io.variables,
+                    "resultado": io.resultado_final,
+                    "error": io.error,
+                    "errores_lote": io.errores_lote,
+                    "tick_inicio": io.tick_inicio,
+                    "tick_fin": self.schedule.steps,
+                })
+                io.registrado = True
+                siguiente = self._siguiente_expresion()
+                if siguiente is not None:
+                    # El mismo agente toma la siguiente expresión
+                    io.reiniciar_expr(*siguiente)
+                elif io is not self.io:
+                    self.schedule.remove(io)
+                    self.grid.remove_agent(io)
+                    continue
+            vivos.append(io)
+        self.ios = vivos
+        self._lanzar_pendientes()
+
+    def columna_resultados(self) -> List[Optional[float]]:
+        """
+        Resultados en el orden de entrada (None donde hubo error). Los de
+        modo lote se abren en un valor por fila.
+        """
+        columna: List[Optional[float]] = []
+        for r in sorted(self.resultados, key=lambda r: r["indice"]):
+            if r["resultado"] is None or r["errores_lote"] is None:
+                columna.append(r["resultado"])
+            else:
+                columna.extend(None if e else v for v, e in
+                               zip(np.ravel(r["resultado"]).tolist(), np.ravel(r["errores_lote"])))
+        return columna
+
+    def pendientes(self) -> int:
+        return sum(1 for io in self.ios if not io.registrado) + len(self._cola_expr)
+
+    def metricas(self) -> Dict[str, float]:
+        """Rendimiento acumulado: expresiones/seg y por tick, espera en cola y peticiones pendientes."""
+        segundos = time.perf_counter() - self._t_inicio
+        ticks = self.schedule.steps
+        # Todos los agentes de cada pool, no solo el primero (agentes_ops)
+        ops = [ag for pool in self.pools.values() for ag in pool]
+        atendidos = sum(ag.atendidos for ag in ops)
+        espera = sum(ag.espera_total for ag in ops)
+        latencias = [r["tick_fin"] - r["tick_inicio"] for r in self.resultados]
+        return {
+            "expresiones": len(self.resultados),
+            "ticks": ticks,
+            "segundos": segundos,
+            "expresiones_por_segundo": len(self.resultados) / segundos if segundos else 0.0,
+            "expresiones_por_tick": len(self.resultados) / ticks if ticks else 0.0,
+            "mensajes_atendidos": atendidos,
+            "peticiones_enviadas": self.peticiones_enviadas,
+            # Peticiones sin atender todavía; al terminar el modelo debe ser 0
+            "pendientes": self.peticiones_enviadas - atendidos,
+            "espera_media_ticks": espera / atendidos if atendidos else 0.0,
+            "latencia_media_ticks": sum(latencias) / len(latencias) if latencias else 0.0,
+        }
+
+    def metricas_pools(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Utilización por operación y por agente, para dimensionar los pools:
+        `utilizacion` es la fracción de ticks en que el agente atendió algo y
+        `atendidos_por_tick` frente a `capacidad_por_tick` dice cuánto margen
+        queda para un rendimiento objetivo.
+        """
+        ticks = self.schedule.steps
+        salida = {}
+        for op, pool in self.pools.items():
+            agentes = [{
+                "id": ag.unique_id,
+                "atendidos": ag.atendidos,
+                "utilizacion": ag.ticks_ocupado / ticks if ticks else 0.0,
+                "espera_media_ticks": ag.espera_total / ag.atendidos if ag.atendidos else 0.0,
+            } for ag in pool]
+            atendidos = sum(a["atendidos"] for a in agentes)
+            salida[op] = {
+                "agentes": agentes,
+                "atendidos_por_tick": atendidos / ticks if ticks else 0.0,
+                "capacidad_por_tick": sum(ag.capacidad for ag in pool),
+                "utilizacion_media": sum(a["utilizacion"] for a in agentes) / len(agentes),
             }
-        )
+        return salida
 
+    # ---- mensajería ----
     def enviar_mensaje(self, msg: Mensaje):
-        self._mensajes.append(msg)
+        if msg.tick is None:
+            msg.tick = self.schedule.steps
+        self.buzon.enviar(msg)
+        if msg.tipo == "request":
+            self.peticiones_enviadas += 1
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar("mensajes_enviados")
 
     def recibir_mensaje(self, receptor_id: int, esperado: Optional[str] = None, tipo: Optional[str] = None):
-        for i, m in enumerate(self._mensajes):
-            if m.receptor == receptor_id and (esperado is None or m.operacion == esperado) and (tipo is None or m.tipo == tipo):
-                return self._mensajes.pop(i)
-        return None
+        msg = self.buzon.recibir(receptor_id, esperado=esperado, tipo=tipo)
+        inst = self.instrumentacion
+        if inst is not None:
+            inst.contar("mensajes_recibidos" if msg is not None else "recepciones_vacias")
+            inst.contar("colas_escaneadas", self.buzon.ultimo_escaneo)
+        return msg
 
     def obtener_id_agente(self, nombre_op: str) -> int:
-        return self.agentes_ops[nombre_op].unique_id
+        pool = self.pools[nombre_op]
+        if len(pool) == 1:
+            return pool[0].unique_id
+        if self.despacho == "round_robin":
+            i = self._turno[nombre_op]
+            self._turno[nombre_op] = (i + 1) % len(pool)
+            return pool[i].unique_id
+        if self.despacho == "menor_cola":
+            # Ante empate gana el primero del pool
+            return min(pool, key=lambda ag: self.buzon.profundidad(ag.unique_id)).unique_id
+        return self.random.choice(pool).unique_id
 
     def step(self):
-        self.datacollector.collect(self)
-        self.schedule.step()
-        if self.io.resultado_final is not None or self.io.error is not None:
+        inst = self.instrumentacion
+        with fase(inst, "collect"):
+            self.datacollector.collect(self)
+        with fase(inst, "schedule"):
+            self.schedule.step()
+        with fase(inst, "recoger_terminados"):
+            self._recoger_terminados()
+        if self.pendientes() == 0:
             self.running = False
 
 
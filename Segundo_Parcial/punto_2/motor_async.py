@@ -0,0 +1,217 @@
+# motor_async.py — motor de ejecución con asyncio para la calculadora.
+#
+# Los agentes de operación pasan a ser corrutinas que consumen Mensaje de una
+# asyncio.Queue, y el lado IO lanza cada operación de la RPN como una tarea
+# que espera solo a sus dos operandos: las subexpresiones independientes
+# (por ejemplo los dos lados de (a*b) + (c/d)) se piden a la vez. Los
+# mensajes y las funciones de cálculo son los mismos que en el modelo por
+# ticks, así que los resultados coinciden con CalculadoraAgentesModel.
+#
+# Uso:
+#   resultado = evaluar_async("(1 * 2) + (3 / 4)", latencia=0.01)
+#
+#   async with MotorAsync(latencia=0.01) as motor:
+#       resultados = await motor.evaluar_muchas(["x + 1", "2 ^ x"], {"x": 3})
+import asyncio
+from typing import Dict, Iterable, List, Optional, Union
+
+from evaluador import ResultadoEvaluacion
+from expresiones import OPERACIONES, Parser, Programa
+from operaciones import FUNCIONES, Mensaje
+
+# Mismos unique_id que en CalculadoraAgentesModel (el IO es el 1)
+OPERADORES = {2: "suma", 3: "resta", 4: "multiplicacion", 5: "division", 6: "potencia"}
+ID_IO = 1
+ID_IO_EXTRA = 7  # los IO adicionales siguen después de los operadores
+
+
+class OperadorAsync:
+    """
+    Versión corrutina de un OperacionAgente. `capacidad` trabajadores
+    consumen la misma cola (el equivalente a atender `capacidad` mensajes por
+    tick) y cada operación tarda `latencia` segundos.
+    """
+
+    def __init__(self, nombre_operacion: str, unique_id: int, motor: "MotorAsync",
+                 capacidad: int = 1, latencia: float = 0.0):
+        self.nombre_operacion = nombre_operacion
+        self.calcular = FUNCIONES[nombre_operacion]
+        self.unique_id = unique_id
+        self.motor = motor
+        self.capacidad = capacidad
+        self.latencia = latencia
+        self.cola: "asyncio.Queue[Optional[Mensaje]]" = asyncio.Queue()
+        self.atendidos = 0
+
+    async def correr(self):
+        while True:
+            msg = await self.cola.get()
+            if msg is None:  # centinela de cierre
+                return
+            if self.latencia:
+                await asyncio.sleep(self.latencia)
+            a, b = msg.operandos
+            if self.nombre_operacion == "division" and b == 0:
+                self.motor.responder(msg, error=ZeroDivisionError("División por cero"))
+                continue
+            try:
+                r = self.calcular(a, b)
+            except Exception as e:  # p. ej. OverflowError en potencia: le llega al IO
+                self.motor.responder(msg, error=e)
+                continue
+            self.atendidos += 1
+            respuesta = Mensaje(
+                tipo="response",
+                operacion=self.nombre_operacion,
+                resultado=r,
+                emisor=self.unique_id,
+                receptor=msg.emisor,
+                correlacion=msg.correlacion
+            )
+            self.motor.responder(msg, respuesta)
+
+
+class MotorAsync:
+    """
+    Agentes de operación como corrutinas más el lado IO. Se usa como
+    administrador de contexto asíncrono: al entrar arranca los trabajadores
+    y al salir los cierra cuando vacían sus colas.
+
+    Igual que en el modelo por agentes, una división por cero lanza
+    ZeroDivisionError y los demás errores se devuelven en
+    ResultadoEvaluacion.error.
+    """
+
+    def __init__(self, capacidad: int = 1, latencia: float = 0.0, parser: Optional[Parser] = None):
+        self.capacidad = capacidad
+        self.latencia = latencia
+        self.parser = parser or Parser()
+        self.operadores: Dict[str, OperadorAsync] = {}
+        self._trabajadores: List[asyncio.Task] = []
+        self._esperas: Dict[int, asyncio.Future] = {}  # id(petición) -> futuro de la respuesta
+        self.mensajes_enviados = 0
+        self.max_en_vuelo = 0  # mayor cantidad de peticiones sin responder a la vez
+
+    async def __aenter__(self):
+        for uid, nombre in OPERADORES.items():
+            op = OperadorAsync(nombre, uid, self, self.capacidad, self.latencia)
+            self.operadores[op.nombre_operacion] = op
+            self._trabajadores.extend(asyncio.create_task(op.correr()) for _ in range(op.capacidad))
+        return self
+
+    async def __aexit__(self, *exc):
+        for op in self.operadores.values():
+            for _ in range(op.capacidad):
+                op.cola.put_nowait(None)
+        await asyncio.gather(*self._trabajadores)
+        self._trabajadores.clear()
+        return False
+
+    # ---- mensajería ----
+    def responder(self, peticion: Mensaje, respuesta: Optional[Mensaje] = None,
+                  error: Optional[BaseException] = None):
+        """Lo llaman los operadores: completa el futuro de la petición."""
+        fut = self._esperas.pop(id(peticion))
+        if fut.cancelled():
+            return
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(respuesta)
+
+    async def solicitar(self, operacion: str, a: float, b: float, emisor: int = ID_IO) -> float:
+        op = self.operadores[operacion]
+        req = Mensaje(
+            tipo="request",
+            operacion=operacion,
+            operandos=(a, b),
+            emisor=emisor,
+            receptor=op.unique_id
+        )
+        fut = asyncio.get_running_loop().create_future()
+        self._esperas[id(req)] = fut
+        self.mensajes_enviados += 1
+        if len(self._esperas) > self.max_en_vuelo:
+            self.max_en_vuelo = len(self._esperas)
+        op.cola.put_nowait(req)
+        resp = await fut
+        return resp.resultado
+
+    async def _operar(self, simbolo: str, a, b, emisor: int) -> float:
+        # Los operandos pueden ser valores o tareas que ya están corriendo
+        if isinstance(a, asyncio.Future):
+            a = await a
+        if isinstance(b, asyncio.Future):
+            b = await b
+        return await self.solicitar(OPERACIONES[simbolo], a, b, emisor)
+
+    # ---- lado IO ----
+    async def evaluar(self, expr: Union[str, Programa], variables: Optional[Dict[str, float]] = None,
+                      emisor: int = ID_IO) -> ResultadoEvaluacion:
+        """
+        Recorre la RPN una vez y crea una tarea por operador; cada una espera
+        a sus operandos y manda su petición apenas están listos, así que todas
+        las operaciones independientes quedan en vuelo al mismo tiempo.
+        """
+        try:
+            programa = expr if isinstance(expr, Programa) else self.parser.compilar(expr)
+        except ValueError as e:
+            return ResultadoEvaluacion(None, str(e))
+
+        variables = variables or {}
+        pila, tareas = [], []
+        error = None
+        for tok in programa.rpn:
+            if tok.es_numero:
+                pila.append(tok.valor)
+                continue
+            if tok.es_variable:
+                if tok.texto not in variables:
+                    error = f"Variable no definida: {tok.texto}"
+                    break
+                pila.append(float(variables[tok.texto]))
+                continue
+            if len(pila) < 2:
+                error = "Faltan operandos"
+                break
+            b = pila.pop()
+            a = pila.pop()
+            tarea = asyncio.ensure_future(self._operar(tok.texto, a, b, emisor))
+            tareas.append(tarea)
+            pila.append(tarea)
+        if error is None and len(pila) != 1:
+            error = "Expresión inválida"
+        if error is not None:
+            # Las tareas todavía no corrieron: se cancelan sin mandar nada
+            for t in tareas:
+                t.cancel()
+            await asyncio.gather(*tareas, return_exceptions=True)
+            return ResultadoEvaluacion(None, error)
+
+        raiz = pila[0]
+        if not isinstance(raiz, asyncio.Future):
+            return ResultadoEvaluacion(raiz, None)
+        try:
+            return ResultadoEvaluacion(await raiz, None)
+        except BaseException:
+            for t in tareas:
+                t.cancel()
+            await asyncio.gather(*tareas, return_exceptions=True)
+            raise
+
+    async def evaluar_muchas(self, expresiones: Iterable[Union[str, Programa]],
+                             variables: Optional[Dict[str, float]] = None) -> List[ResultadoEvaluacion]:
+        """Evalúa todas las expresiones a la vez (un emisor distinto por expresión)."""
+        return await asyncio.gather(*(
+            self.evaluar(e, variables, emisor=ID_IO if i == 0 else ID_IO_EXTRA + i - 1)
+            for i, e in enumerate(expresiones)
+        ))
+
+
+def evaluar_async(expr: Union[str, Programa], variables: Optional[Dict[str, float]] = None,
+                  capacidad: int = 1, latencia: float = 0.0) -> ResultadoEvaluacion:
+    """Atajo sincrónico: arranca un loop, evalúa `expr` y cierra el motor."""
+    async def _correr():
+        async with MotorAsync(capacidad, latencia) as motor:
+            return await motor.evaluar(expr, variables)
+    return asyncio.run(_correr())
@@ -0,0 +1,84 @@
+# operaciones.py — mensajes y funciones de cálculo de la calculadora, sin Mesa.
+#
+# Los agentes de operación (agentes_operaciones.py), el evaluador directo y el
+# motor asyncio usan estas mismas funciones, así que los resultados y los
+# errores coinciden entre los tres. Importar este módulo no carga Mesa.
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class Mensaje:
+    """Mensaje simple de petición/respuesta."""
+    tipo: str                 # 'request' o 'response'
+    operacion: str            # suma, resta, multiplicacion, division, potencia
+    operandos: Tuple[float, float] | None = None
+    resultado: Optional[float] = None
+    emisor: Optional[int] = None
+    receptor: Optional[int] = None
+    tick: Optional[int] = None  # tick en que se envió (para medir espera en cola)
+    correlacion: Optional[int] = None  # id de la petición; la respuesta lo repite
+
+
+# Banderas por elemento de MensajeLote.errores (se combinan con |)
+ERROR_DIVISION_CERO = 1
+ERROR_DESBORDE = 2
+ERROR_INVALIDO = 4
+DESCRIPCION_ERRORES = {
+    ERROR_DIVISION_CERO: "División por cero",
+    ERROR_DESBORDE: "Desbordamiento",
+    ERROR_INVALIDO: "Resultado inválido",
+}
+
+
+@dataclass
+class MensajeLote(Mensaje):
+    """
+    Mensaje con muchos pares de operandos: `operandos` son dos arreglos (o
+    escalares) que se difunden entre sí, y la respuesta trae `resultado` y
+    `errores` del mismo largo. Un elemento con error queda en nan y su
+    bandera dice por qué (ver ERROR_*), en vez de lanzar una excepción que
+    tiraría todo el lote.
+    """
+    errores: Optional[np.ndarray] = None
+
+
+def describir_errores(banderas: int) -> Optional[str]:
+    """Texto de las banderas de un elemento, o None si no hubo error."""
+    if not banderas:
+        return None
+    return ", ".join(texto for bit, texto in DESCRIPCION_ERRORES.items() if banderas & bit)
+
+
+def suma(a, b): return a + b
+def resta(a, b): return a - b
+def multiplicacion(a, b): return a * b
+def division(a, b): return a / b
+def potencia(a, b): return a ** b
+
+
+# Nombre de la operación (el mismo de Mensaje.operacion) -> función
+FUNCIONES = {f.__name__: f for f in (suma, resta, multiplicacion, division, potencia)}
+
+
+def calcular_lote(operacion: str, a, b) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aplica FUNCIONES[operacion] elemento a elemento con NumPy, en una sola
+    llamada. Devuelve (resultado, errores): los elementos con división por
+    cero, desborde (inf desde operandos finitos) o resultado inválido (nan
+    desde operandos finitos, p. ej. base negativa con exponente
+    fraccionario) quedan en nan con su bandera en `errores`.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    with np.errstate(all="ignore"):
+        r = np.array(FUNCIONES[operacion](a, b), dtype=float)
+    errores = np.zeros(r.shape, dtype=np.uint8)
+    finitos = np.isfinite(a) & np.isfinite(b)
+    errores[np.isinf(r) & finitos] = ERROR_DESBORDE
+    errores[np.isnan(r) & finitos] = ERROR_INVALIDO
+    if operacion == "division":
+        errores[b == 0] = ERROR_DIVISION_CERO
+    r[errores != 0] = np.nan
+    return r, errores
@@ -0,0 +1,17 @@
+# rutas.py — acceso a los módulos compartidos de Segundo_Parcial/comun.
+#
+# Los módulos que usan los dos puntos (colector, instrumentación, servidor de
+# deltas, tiempo de import) viven una sola vez en ../comun. Cada script se
+# corre desde su propio directorio, así que quien importa algo de ahí llama
+# antes a rutas.agregar_comun().
+import os
+import sys
+
+COMUN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "comun")
+
+
+def agregar_comun():
+    """Pone ../comun en sys.path (una sola vez) y devuelve la ruta."""
+    if COMUN not in sys.path:
+        sys.path.insert(0, COMUN)
+    return COMUN
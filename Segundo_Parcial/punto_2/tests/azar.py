@@ -0,0 +1,26 @@
+# Expresiones al azar para comparar motores de evaluación entre sí.
+import random
+
+VARIABLES = {"x": 3.0, "y": -2.5, "z": 0.0}
+
+
+def expresion_azar(rng: random.Random, profundidad: int = 4) -> str:
+    """
+    Expresión con + - * /, potencias de exponente entero chico, variables,
+    literales negativos, menos unario y paréntesis. Puede dividir por cero.
+    """
+    if profundidad == 0 or rng.random() < 0.2:
+        hoja = rng.choice([str(rng.randint(0, 9)), f"{rng.randint(1, 9)}.5",
+                           f"-{rng.randint(1, 9)}", *VARIABLES])
+        return f"-{hoja}" if rng.random() < 0.1 and not hoja.startswith("-") else hoja
+    if rng.random() < 0.15:
+        return f"({expresion_azar(rng, profundidad - 1)}) ^ {rng.randint(0, 3)}"
+    op = rng.choice("+-*/")
+    izq = expresion_azar(rng, profundidad - 1)
+    der = expresion_azar(rng, profundidad - 1)
+    return f"({izq}) {op} ({der})" if rng.random() < 0.5 else f"{izq} {op} {der}"
+
+
+def expresiones_azar(cantidad: int, semilla: int = 0, profundidad: int = 4):
+    rng = random.Random(semilla)
+    return [expresion_azar(rng, profundidad) for _ in range(cantidad)]
@@ -0,0 +1,6 @@
+# Los módulos del punto se importan como scripts sueltos (igual que al
+# correrlos desde punto_2), así que el directorio del punto va a sys.path.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,42 @@
+import pytest
+
+from azar import VARIABLES, expresiones_azar
+from modelo_calculadora import CalculadoraAgentesModel
+
+EXPRESIONES = [e for e in expresiones_azar(80, semilla=11, profundidad=5) if "/ z" not in e]
+
+
+def _correr(expresiones, **kwargs):
+    modelo = CalculadoraAgentesModel(expresiones[0], expresiones=expresiones, variables=VARIABLES,
+                                     seed=0, **kwargs)
+    while modelo.running:
+        modelo.step()
+    return modelo
+
+
+def _por_indice(modelo):
+    return [(r["resultado"], r["error"]) for r in sorted(modelo.resultados, key=lambda r: r["indice"])]
+
+
+@pytest.mark.parametrize("agentes, despacho", [(1, "round_robin"), (3, "menor_cola"), (3, "aleatorio")])
+def test_dag_igual_que_secuencial(agentes, despacho):
+    expresiones = []
+    for e in EXPRESIONES:
+        try:
+            _correr([e])
+        except ZeroDivisionError:
+            continue  # la división por cero corta el modelo entero en ambos modos
+        expresiones.append(e)
+    assert len(expresiones) > 40
+
+    secuencial = _correr(expresiones)
+    dag = _correr(expresiones, modo_io="dag", agentes_por_operacion=agentes, despacho=despacho)
+    assert _por_indice(dag) == _por_indice(secuencial)
+    assert dag.schedule.steps <= secuencial.schedule.steps
+
+
+def test_dag_comparte_subexpresiones():
+    secuencial = _correr(["(x + 1) * (x + 1) + (x + 1)"])
+    dag = _correr(["(x + 1) * (x + 1) + (x + 1)"], modo_io="dag")
+    assert _por_indice(dag) == _por_indice(secuencial) == [(20.0, None)]
+    assert dag.peticiones_enviadas == 3 < secuencial.peticiones_enviadas
@@ -0,0 +1,45 @@
+import math
+
+import pytest
+
+from azar import VARIABLES, expresiones_azar
+from evaluador import evaluar
+from modelo_calculadora import CalculadoraAgentesModel
+from motor_async import evaluar_async
+
+
+def _resultado(funcion, *args, **kwargs):
+    """(valor, error) o ("ZeroDivisionError", None) si la evaluación lo lanza."""
+    try:
+        r = funcion(*args, **kwargs)
+    except ZeroDivisionError:
+        return "ZeroDivisionError", None
+    return r
+
+
+def _agentes(expr, **kwargs):
+    modelo = CalculadoraAgentesModel(expr, variables=VARIABLES, seed=0, **kwargs)
+    while modelo.running:
+        modelo.step()
+    return modelo.io.resultado_final, modelo.io.error
+
+
+def _iguales(a, b):
+    (va, ea), (vb, eb) = a, b
+    if isinstance(va, float) and isinstance(vb, float):
+        return (va == vb or (math.isnan(va) and math.isnan(vb))) and ea == eb
+    return (va, ea) == (vb, eb)
+
+
+@pytest.mark.parametrize("expr", expresiones_azar(60, semilla=5))
+def test_directo_y_async_igual_que_agentes(expr):
+    esperado = _resultado(_agentes, expr)
+    directo = _resultado(lambda: tuple(evaluar(expr, VARIABLES)))
+    asincrono = _resultado(lambda: tuple(evaluar_async(expr, VARIABLES)))
+    assert _iguales(directo, esperado), (expr, directo, esperado)
+    assert _iguales(asincrono, esperado), (expr, asincrono, esperado)
+
+
+@pytest.mark.parametrize("expr", ["2 +", "(1 + 2", "w + 1", "2 $ 3", ""])
+def test_errores_igual_que_agentes(expr):
+    assert tuple(evaluar(expr, VARIABLES)) == _agentes(expr)
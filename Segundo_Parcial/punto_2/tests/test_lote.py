@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from azar import expresiones_azar
+from evaluador import evaluar
+from modelo_calculadora import CalculadoraAgentesModel
+from operaciones import ERROR_DIVISION_CERO
+
+TABLA = {"x": [3.0, 0.0, -1.5, 2.0], "y": [-2.5, 1.0, 0.0, 4.0], "z": [0.0, 2.0, 1.0, -3.0]}
+
+
+def _lote(expr):
+    modelo = CalculadoraAgentesModel(expr, tabla=TABLA, modo_io="lote", seed=0)
+    while modelo.running:
+        modelo.step()
+    (r,) = modelo.resultados
+    return r["resultado"], r["errores_lote"]
+
+
+def _por_fila(expr):
+    valores = []
+    for i in range(len(TABLA["x"])):
+        fila = {nombre: columna[i] for nombre, columna in TABLA.items()}
+        try:
+            r = evaluar(expr, fila)
+        except ZeroDivisionError:
+            valores.append(np.nan)
+            continue
+        valores.append(r.resultado)
+    return np.array(valores, dtype=float)
+
+
+@pytest.mark.parametrize("expr", expresiones_azar(40, semilla=7))
+def test_lote_igual_que_fila_por_fila(expr):
+    resultado, errores = _lote(expr)
+    assert resultado.shape == errores.shape == (len(TABLA["x"]),)
+    np.testing.assert_array_equal(resultado, _por_fila(expr))
+    # Una fila con error queda en nan con su bandera
+    assert ((errores != 0) == np.isnan(resultado)).all()
+
+
+def test_division_por_cero_marca_solo_su_fila():
+    resultado, errores = _lote("x / y")
+    assert errores.tolist() == [0, 0, ERROR_DIVISION_CERO, 0]
+    np.testing.assert_array_equal(resultado, [3.0 / -2.5, 0.0, np.nan, 0.5])
+
+
+def test_constante_se_difunde_a_toda_la_tabla():
+    resultado, errores = _lote("2 + 3")
+    np.testing.assert_array_equal(resultado, [5.0] * 4)
+    assert errores.tolist() == [0] * 4
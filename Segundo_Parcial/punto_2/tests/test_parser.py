@@ -0,0 +1,56 @@
+import pytest
+
+from benchmark_parser import rpn_original
+from evaluador import evaluar
+from expresiones import ErrorSintaxis, Parser
+
+
+def rpn(expr):
+    return " ".join(t.texto for t in Parser().compilar_rpn(expr))
+
+
+# (expresión, variables, valor esperado, misma RPN que el parser original).
+# El original pega el signo a cualquier literal ("-2^2" = (-2)^2) y no
+# acepta el menos delante de "(" o de una variable; el de una pasada niega
+# la potencia entera en todos los casos.
+CASOS_SIGNO = [
+    ("-2", {}, -2.0, True),
+    ("3 * -2", {}, -6.0, True),
+    ("-2 * 3", {}, -6.0, True),
+    ("2 ^ -2", {}, 0.25, True),
+    ("2 ^ -1", {}, 0.5, True),
+    ("2 - -2", {}, 4.0, True),
+    ("3 - 2 ^ 2", {}, -1.0, True),
+    ("3-2", {}, 1.0, False),  # el original lee 3 y -2
+    ("(-3) * -2", {}, 6.0, True),
+    ("-2 ^ 2", {}, -4.0, False),
+    ("3 * -2 ^ 2", {}, -12.0, False),
+    ("2 ^ -2 ^ 2", {}, 2.0 ** -4, False),
+    ("-x ^ 2", {"x": 3}, -9.0, None),  # en el original la RPN queda inválida
+    ("-(2) ^ 2", {}, -4.0, None),
+    ("-x * 2", {"x": 3}, -6.0, None),
+]
+
+
+@pytest.mark.parametrize("expr, variables, esperado, igual_original", CASOS_SIGNO)
+def test_signos(expr, variables, esperado, igual_original):
+    assert evaluar(expr, variables).resultado == pytest.approx(esperado, abs=1e-12)
+    if igual_original is not None:
+        assert (rpn(expr).split() == rpn_original(expr)) == igual_original
+
+
+def test_resta_sin_espacios_es_resta():
+    assert rpn("3-2") == "3 2 -"
+    assert rpn("x-2") == "x 2 -"
+
+
+@pytest.mark.parametrize("expr, posicion", [
+    ("2 + * 3", 4),
+    ("(1 + 2", 0),
+    ("1 + 2)", 5),
+    ("2 $ 3", 2),
+])
+def test_errores_con_posicion(expr, posicion):
+    with pytest.raises(ErrorSintaxis) as e:
+        Parser().compilar_rpn(expr)
+    assert e.value.posicion == posicion
@@ -0,0 +1,26 @@
+import pytest
+
+from modelo_calculadora import CalculadoraAgentesModel
+
+EXPRESIONES = ["1 + 2 * 3 - 4 / 5", "(1 + 2) * (3 + 4) ^ 2", "x * x - x / 2 + 7"]
+
+
+def _correr(**kwargs):
+    modelo = CalculadoraAgentesModel(EXPRESIONES[0], expresiones=EXPRESIONES,
+                                     variables={"x": 3.0}, seed=1, **kwargs)
+    while modelo.running:
+        modelo.step()
+    return modelo
+
+
+@pytest.mark.parametrize("modo_io", ["secuencial", "dag"])
+@pytest.mark.parametrize("despacho", ["round_robin", "menor_cola", "aleatorio"])
+@pytest.mark.parametrize("agentes", [1, 4])
+def test_cada_peticion_se_atiende_una_vez(despacho, agentes, modo_io):
+    modelo = _correr(agentes_por_operacion=agentes, despacho=despacho, modo_io=modo_io)
+    m = modelo.metricas()
+    assert m["peticiones_enviadas"] > 0
+    assert m["mensajes_atendidos"] == m["peticiones_enviadas"]
+    assert m["pendientes"] == 0
+    por_pool = sum(a["atendidos"] for op in modelo.metricas_pools().values() for a in op["agentes"])
+    assert por_pool == m["mensajes_atendidos"]